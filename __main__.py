@@ -1,28 +1,46 @@
-import os
-from dotenv import load_dotenv
+import sys
 from telegram.ext import Application
 
+from redditcommand.config import SETTINGS, RedditClientManager
 from redditcommand.utils.log_manager import LogManager
+from redditcommand.utils.session import GlobalSession
+from redditcommand.utils.ytdlp_runner import YtDlpRunner
 from telegram_utils.regist import TelegramRegistrar
 
-def main():
-    load_dotenv()
+try:
+    import uvloop
+except ImportError:  # optional speedup
+    uvloop = None
+
+def install_event_loop():
+    if uvloop is not None and sys.platform != "win32":
+        uvloop.install()
+        return "uvloop"
+    return "asyncio"
 
+async def close_sessions(application):
+    await GlobalSession.close()
+    await RedditClientManager.close()
+    YtDlpRunner.shutdown()
+
+def main():
     LogManager.setup_error_logging("logs/error.log")
     logger = LogManager.setup_main_logger()
     logger.info("Bot is starting...")
+    logger.info(f"Using {install_event_loop()} event loop")
 
-    telegram_api_key = os.getenv("TELEGRAM_API_KEY")
-    telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    telegram_api_key = SETTINGS.telegram_api_key
+    telegram_chat_id = SETTINGS.telegram_chat_id
 
     if not telegram_api_key or not telegram_chat_id:
         logger.error("Missing TELEGRAM_API_KEY or TELEGRAM_CHAT_ID in environment.")
         return
 
     application = Application.builder().token(telegram_api_key).build()
+    application.post_shutdown = close_sessions
 
     TelegramRegistrar.register_command_handlers(application)
-    TelegramRegistrar.register_jobs(application, int(telegram_chat_id))
+    TelegramRegistrar.register_jobs(application, telegram_chat_id)
 
     logger.info("Bot is now polling...")
     application.run_polling()
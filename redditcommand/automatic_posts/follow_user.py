@@ -42,7 +42,9 @@ class FollowedUserMonitor:
         for reddit_user, telegram_users in self.followed_map.items():
             await self._handle_user_posts(reddit_user, telegram_users, resolver, target)
 
-        FollowedUserStore.save_seen_post_ids(self.new_seen)
+        # new_seen only grows from seen_post_ids; most runs find nothing new and skip the rewrite
+        if len(self.new_seen) > len(self.seen_post_ids):
+            FollowedUserStore.save_seen_post_ids(self.new_seen)
 
     async def _handle_user_posts(self, reddit_user, telegram_users, resolver, target):
         try:
@@ -95,7 +97,7 @@ class FollowedUserMonitor:
                                 )
                                 if smaller and await MediaUtils.validate_file(smaller):
                                     await send_fn(smaller, target, caption=caption)
-                                    TempFileManager.cleanup_file(smaller)
+                                    await TempFileManager.acleanup(smaller)
                                 else:
                                     logger.error("Retry compression failed or still too large.")
 
@@ -142,7 +144,7 @@ class FollowedUserMonitor:
         final_path = await Compressor.validate_and_compress(file_path, MediaConfig.MAX_FILE_SIZE_MB)
         if final_path:
             if final_path != file_path:
-                TempFileManager.cleanup_file(file_path)
+                await TempFileManager.acleanup(file_path)
             return final_path
 
         # If we get here, even compression policy refused (too big or failed)
@@ -1,12 +1,11 @@
 # redditcommand/automatic_posts/top_post_scheduler.py
 
-import os
 from datetime import datetime
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from redditcommand.automatic_posts.top_post import TopPostManager
-from redditcommand.config import TelegramConfig
+from redditcommand.config import TelegramConfig, SETTINGS
 
 
 class TopPostScheduler:
@@ -26,7 +25,7 @@ class TopPostScheduler:
         if time_filter == "year" and not (now.month == 1 and now.day == 1):
             return
 
-        chat_id = int(os.getenv("TELEGRAM_CHAT_ID"))
+        chat_id = SETTINGS.telegram_chat_id
         target = (context.bot, chat_id)
 
         manager = TopPostManager()
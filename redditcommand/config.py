@@ -1,21 +1,61 @@
 # redditcommand/config.py
 
 import os
+import functools
 import asyncpraw
+from dataclasses import dataclass
 from datetime import timezone, timedelta
+from typing import Optional
 
 from dotenv import load_dotenv
 
-load_dotenv()
+
+def _optional_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Environment-derived settings, read once at import after loading .env.
+    """
+    telegram_api_key: Optional[str]
+    telegram_chat_id: Optional[int]
+    reddit_client_id: Optional[str]
+    reddit_client_secret: Optional[str]
+    reddit_user_agent: Optional[str]
+    reddit_username: Optional[str]
+    reddit_password: Optional[str]
+    log_level: str
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        load_dotenv()
+        return cls(
+            telegram_api_key=os.getenv("TELEGRAM_API_KEY"),
+            telegram_chat_id=_optional_int(os.getenv("TELEGRAM_CHAT_ID")),
+            reddit_client_id=os.getenv("REDDIT_CLIENT_ID"),
+            reddit_client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+            reddit_user_agent=os.getenv("REDDIT_USER_AGENT"),
+            reddit_username=os.getenv("REDDIT_USERNAME"),
+            reddit_password=os.getenv("REDDIT_PASSWORD"),
+            log_level=os.getenv("LOG_LEVEL", "DEBUG"),
+        )
+
+SETTINGS = Settings.from_env()
 
 class RedditConfig:
     @staticmethod
+    @functools.cache
     def load_reddit_config():
         """
-        Loads Reddit API credentials from environment variables.
+        Returns Reddit API credentials from SETTINGS, keyed by environment variable name.
+        The result is memoized; a failed lookup is not cached and will be retried.
         """
         required_keys = ["REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET", "REDDIT_USER_AGENT", "REDDIT_USERNAME", "REDDIT_PASSWORD"]
-        config = {key: os.getenv(key) for key in required_keys}
+        config = {key: getattr(SETTINGS, key.lower()) for key in required_keys}
 
         # Ensure all required keys are present
         missing_keys = [key for key, value in config.items() if not value]
@@ -29,13 +69,17 @@ class RedditConfig:
         """
         Initializes and returns an asyncpraw Reddit client.
         """
+        from redditcommand.utils.session import build_reddit_session
+
         config = RedditConfig.load_reddit_config()
+        session = build_reddit_session()
         return asyncpraw.Reddit(
             client_id=config["REDDIT_CLIENT_ID"],
             client_secret=config["REDDIT_CLIENT_SECRET"],
             user_agent=config["REDDIT_USER_AGENT"],
             username=config["REDDIT_USERNAME"],
             password=config["REDDIT_PASSWORD"],
+            requestor_kwargs={"session": session} if session else None,
         )
 
 class RedditClientManager:
@@ -50,17 +94,59 @@ class RedditClientManager:
             cls._client = await RedditConfig.initialize_reddit()
         return cls._client
 
+    @classmethod
+    async def close(cls):
+        """
+        Closes the shared Reddit client and its HTTP session, if one was created.
+        """
+        if cls._client is not None:
+            await cls._client.close()
+            cls._client = None
+
+class InflightConfig:
+    TTL_SECONDS = 30
+    MAX_ENTRIES = 256
+    SUBREDDIT_TTL_SECONDS = 3600
+    TOP_COMMENT_TTL_SECONDS = 600
+
+class RateLimitConfig:
+    LOW_WATERMARK = 10  # remaining requests below which Reddit calls are serialized
+    REQUESTS_PER_MINUTE = 100  # Reddit's OAuth quota; request starts are paced to this rate
+    BURST = 20  # requests allowed back to back before pacing kicks in
+
+class HttpConfig:
+    CONNECTOR_LIMIT = 100  # sockets open at once across all media hosts (shared GlobalSession)
+    CONNECTOR_LIMIT_PER_HOST = 10  # per CDN host, so one slow host cannot take every socket
+    DNS_CACHE_TTL = 300
+    KEEPALIVE_TIMEOUT = 75
+
 class TimeoutConfig:
     DOWNLOAD_TIMEOUT = 300
 
 class RetryConfig:
-    RETRY_ATTEMPTS = 1
+    RETRY_ATTEMPTS = 1  # fetch rounds per pipeline run, and send attempts per upload; upload backoff only runs above 1
+    UPLOAD_BACKOFF_SECONDS = 2  # doubled per failed upload attempt, plus up to 1s jitter
+    MAX_UPLOAD_BACKOFF_SECONDS = 30
 
 class MediaConfig:
     MAX_FILE_SIZE_MB = 50
-    DEFAULT_SEMAPHORE_LIMIT = 10
+    MAX_DOWNLOAD_SIZE_MB = 100  # compressor hard cap; larger files are never usable
+    DOWNLOAD_CHUNK_SIZE = 256 * 1024
+    DOWNLOAD_RESUME_ATTEMPTS = 2  # Range-resumes after a transfer breaks off midway
+    DEFAULT_SEMAPHORE_LIMIT = 10  # concurrent Reddit API calls; media HTTP sockets are capped by HttpConfig.CONNECTOR_LIMIT*
+    DOWNLOAD_CONCURRENCY = 4  # posts resolved/downloaded at once per batch
+    UPLOAD_CONCURRENCY = 2  # Telegram uploads in flight per batch; also the ready-file queue size
+    URL_UPLOAD_PHOTO_MAX_MB = 5  # Telegram fetches photos up to this size from a URL itself
+    FFMPEG_CONCURRENCY = 2  # ffmpeg encodes at once (probes are not counted); each encode already spreads its threads over every core
+    FFMPEG_NICENESS = 10  # POSIX nice value for ffmpeg encodes so they do not starve the bot itself; probes keep normal priority
+    HW_VIDEO_ENCODER = "h264_nvenc"  # used for GIF re-encodes when ffmpeg lists it; None forces libx264
+    COMPRESS_AUDIO_KBPS = 96
+    TWO_PASS_SIZE_MARGIN = 0.95  # aim under the size limit to leave room for container overhead
+    TWO_PASS_MIN_VIDEO_KBPS = 150  # below this a long clip is unwatchable; fall back to CRF
     MAX_MEDIA_COUNT = 10
     POST_LIMIT = 100
+    COMBINED_POST_LIMIT = 100  # one listing page; Reddit returns at most 100 items per request
+    COMBINED_OVERFETCH = 10  # merged-listing posts fetched per requested post; most are not media
 
 class PipelineConfig:
     INITIAL_BACKOFF_SECONDS = 1.0
@@ -93,12 +179,17 @@ class RedditDefaults:
 
 class RedditVideoConfig:
     DASH_RESOLUTIONS = ["1080", "720", "480", "360"]
+    YTDLP_CONCURRENT_FRAGMENTS = 4
+    YTDLP_WORKERS = 2  # yt-dlp jobs running at once, one child process each
 
 class CommentFilterConfig:
     BLACKLIST_TERMS = {
         "http", "www", ".com", "[deleted]", "sauce", "[removed]",
         "u/", "source", "![gif]"
     }
+    COMMENT_SORT = "top"
+    COMMENT_LIMIT = 10  # top-level comments fetched when looking for a caption comment
+    MAX_COMMENT_LENGTH = 2000  # walls of text are skipped; they would not fit a caption anyway
 
 class MediaValidationConfig:
     VALID_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".mp4", ".webm", ".gifv")
@@ -117,6 +208,8 @@ class MediaValidationConfig:
         "video": ["v.redd.it", "streamable.com", "redgifs.com"]
     }
 
+    URL_CACHE_SIZE = 8192  # memoized classifier results; listings repeat across retries
+
 class FileStateConfig:
     FOLLOWED_USERS_PATH = "followed_users.json"
     SEEN_POSTS_PATH = "seen_user_posts.json"
@@ -2,25 +2,32 @@
 
 import asyncio
 import random
-from typing import Optional, List, Set
+from typing import Callable, Optional, List, Set, Dict, Tuple
 from asyncpraw.models import Submission
 
 from .config import RedditClientManager, MediaConfig, RedditDefaults
 from .filter_posts import MediaPostFilter
 from redditcommand.utils.fetch_utils import RedditPostFetcher, FetchOrchestrator
+from redditcommand.utils.rate_limiter import RedditRateLimiter
 from redditcommand.utils.log_manager import LogManager
 
 logger = LogManager.setup_main_logger()
 
 
+class _WaveSatisfied(Exception):
+    """Raised inside a fetch wave once enough posts are collected, cancelling sibling tasks."""
+
+
 class MediaPostFetcher:
-    def __init__(self, semaphore: Optional[asyncio.Semaphore] = None):
-        self.semaphore = semaphore or asyncio.Semaphore(MediaConfig.DEFAULT_SEMAPHORE_LIMIT)
+    def __init__(self, limiter: Optional[RedditRateLimiter] = None):
+        self.limiter = limiter or RedditRateLimiter(max_concurrency=MediaConfig.DEFAULT_SEMAPHORE_LIMIT)
         self.reddit = None
 
     async def init_client(self):
         if not self.reddit:
             self.reddit = await RedditClientManager.get_client()
+        if getattr(self.limiter, "reddit", False) is None:
+            self.limiter.bind(self.reddit)
 
     async def fetch_from_subreddits(
         self,
@@ -33,20 +40,26 @@ class MediaPostFetcher:
         update=None,
         invalid_subreddits: Optional[Set[str]] = None,
         processed_urls: Optional[Set[str]] = None,
+        on_posts: Optional[Callable[[Submission], None]] = None,
     ) -> List[Submission]:
+        """
+        Returns up to media_count posts unique by URL. When on_posts is given it is called
+        with each of those posts as soon as its subreddit is filtered, so callers can start
+        processing before the slower subreddits finish.
+        """
         await self.init_client()
 
         invalid_subreddits = invalid_subreddits or set()
-        processed_urls = processed_urls or set()
+        processed_urls = processed_urls if processed_urls is not None else set()
         processed_post_ids = set()
-        media_posts: List[Submission] = []
 
         valid_subreddits = [s for s in subreddit_names if s not in invalid_subreddits]
         if not valid_subreddits:
             logger.warning("No valid subreddits to fetch from.")
             return []
 
-        random.shuffle(valid_subreddits)
+        # Randomize which subreddits get the remainder without touching caller data
+        valid_subreddits = random.sample(valid_subreddits, len(valid_subreddits))
 
         n = len(valid_subreddits)
         requested_total = max(0, media_count)
@@ -60,46 +73,68 @@ class MediaPostFetcher:
             if alloc > 0:
                 allocations[s] = alloc
 
+        seen_urls: Set[str] = set()
+        unique_by_url: List[Submission] = []
+
+        def collect(posts: List[Submission]) -> None:
+            # processed_urls is already applied per subreddit by MediaPostFilter;
+            # this only removes the same media surfacing in several subreddits.
+            for post in posts:
+                url = getattr(post, "url", None)
+                if not url or url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                unique_by_url.append(post)
+                if on_posts and len(unique_by_url) <= requested_total:
+                    on_posts(post)
+
         async def run_wave(subs_to_fetch, per_sub_alloc):
-            tasks = [
-                self.fetch_from_single_subreddit(
-                    subreddit_name=s,
-                    search_terms=search_terms,
-                    sort=sort,
-                    time_filter=time_filter,
-                    media_type=media_type,
-                    target_count=per_sub_alloc[s],
-                    processed_post_ids=processed_post_ids,
-                    update=update,
-                    processed_urls=processed_urls,
-                )
-                for s in subs_to_fetch
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            out = []
-            for s_name, result in zip(subs_to_fetch, results):
-                if isinstance(result, Exception):
-                    logger.error(f"Subreddit '{s_name}' task failed: {result}", exc_info=True)
-                elif isinstance(result, list):
-                    out.extend(result)
+            async def fetch_one(s_name):
+                try:
+                    result = await self.fetch_from_single_subreddit(
+                        subreddit_name=s_name,
+                        search_terms=search_terms,
+                        sort=sort,
+                        time_filter=time_filter,
+                        media_type=media_type,
+                        target_count=per_sub_alloc[s_name],
+                        processed_post_ids=processed_post_ids,
+                        update=update,
+                        processed_urls=processed_urls,
+                    )
+                except Exception as exc:
+                    logger.error(f"Subreddit '{s_name}' task failed: {exc}", exc_info=exc)
+                    return
+                if isinstance(result, list):
+                    collect(result)
                 else:
                     logger.warning(f"Unexpected result from subreddit '{s_name}': {type(result)}")
-            return out
+                if len(unique_by_url) >= requested_total:
+                    raise _WaveSatisfied()
 
-        subs_wave1 = list(allocations.keys())
-        posts_wave1 = await run_wave(subs_wave1, allocations)
-        media_posts.extend(posts_wave1)
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for s in subs_to_fetch:
+                        tg.create_task(fetch_one(s))
+            except* _WaveSatisfied:
+                logger.debug("Requested post count reached; cancelled outstanding subreddit fetches")
 
-        seen_urls: Set[str] = set()
-        unique_by_url: List[Submission] = []
-        for post in media_posts:
-            url = getattr(post, "url", None)
-            if not url:
-                continue
-            if url in seen_urls:
-                continue
-            seen_urls.add(url)
-            unique_by_url.append(post)
+        shortfall = allocations
+        if len(valid_subreddits) > 1 and not any(s.lower() == "random" for s in valid_subreddits):
+            combined, shortfall = await self.fetch_from_combined_subreddits(
+                subreddit_names=valid_subreddits,
+                search_terms=search_terms,
+                sort=sort,
+                time_filter=time_filter,
+                media_type=media_type,
+                allocations=allocations,
+                processed_urls=processed_urls,
+                processed_post_ids=processed_post_ids,
+            )
+            collect(combined)
+
+        if shortfall and len(unique_by_url) < requested_total:
+            await run_wave(list(shortfall), shortfall)
 
         remaining_needed = requested_total - len(unique_by_url)
         if remaining_needed > 0:
@@ -117,15 +152,7 @@ class MediaPostFetcher:
 
             if subs_wave2:
                 per_sub_alloc2 = {s: 1 for s in subs_wave2}
-                posts_wave2 = await run_wave(subs_wave2, per_sub_alloc2)
-                for post in posts_wave2:
-                    url = getattr(post, "url", None)
-                    if not url or url in seen_urls:
-                        continue
-                    seen_urls.add(url)
-                    unique_by_url.append(post)
-                    if len(unique_by_url) >= requested_total:
-                        break
+                await run_wave(subs_wave2, per_sub_alloc2)
 
         logger.info(
             f"Collected {len(unique_by_url)} unique posts after up to two waves. "
@@ -133,6 +160,70 @@ class MediaPostFetcher:
         )
         return unique_by_url[:media_count]
 
+    async def fetch_from_combined_subreddits(
+        self,
+        subreddit_names: List[str],
+        search_terms: Optional[List[str]],
+        sort: str,
+        time_filter: Optional[str],
+        media_type: Optional[str],
+        allocations: Dict[str, int],
+        processed_urls: Set[str],
+        processed_post_ids: Set[str],
+    ) -> Tuple[List[Submission], Dict[str, int]]:
+        """
+        Fetch all subreddits with a single multireddit request, then filter per subreddit.
+        Returns the selected posts and, per subreddit, how many allocated posts the listing
+        did not supply. Those still need their own fetch: popular subreddits crowd small
+        ones out of a combined listing.
+        """
+        # Sized from what was asked for, so the merged listing stays a single page request
+        limit = min(sum(allocations.values()) * MediaConfig.COMBINED_OVERFETCH, MediaConfig.COMBINED_POST_LIMIT)
+        async with self.limiter:
+            try:
+                posts = await FetchOrchestrator.get_combined_posts(
+                    reddit=self.reddit,
+                    subreddit_names=subreddit_names,
+                    search_terms=search_terms,
+                    sort=sort,
+                    time_filter=time_filter,
+                    limit=limit,
+                )
+            except Exception as e:
+                logger.error(f"Combined fetch failed for {'+'.join(subreddit_names)}: {e}", exc_info=True)
+                return [], dict(allocations)
+
+        buckets: Dict[str, List[Submission]] = {}
+        for post in posts:
+            name = getattr(getattr(post, "subreddit", None), "display_name", None) or ""
+            buckets.setdefault(name.lower(), []).append(post)
+
+        selected: List[Submission] = []
+        shortfall: Dict[str, int] = {}
+        for name in subreddit_names:
+            wanted = allocations.get(name, 0)
+            if wanted <= 0:
+                continue
+            bucket = buckets.get(name.lower())
+            if not bucket:
+                shortfall[name] = wanted
+                continue
+            filterer = MediaPostFilter(
+                subreddit_name=name,
+                media_type=media_type,
+                media_count=wanted,
+                processed_urls=processed_urls,
+                processed_post_ids=processed_post_ids,
+            )
+            filtered = await filterer.filter(bucket)
+            unique = await RedditPostFetcher.filter_duplicates(filtered, processed_post_ids)
+            selected.extend(unique)
+            if len(unique) < wanted:
+                shortfall[name] = wanted - len(unique)
+
+        logger.info(f"r/{'+'.join(subreddit_names)}: {len(selected)} posts from combined listing")
+        return selected, shortfall
+
 
     async def fetch_from_single_subreddit(
         self,
@@ -146,7 +237,7 @@ class MediaPostFetcher:
         update,
         processed_urls: Set[str],
     ) -> List[Submission]:
-        async with self.semaphore:
+        async with self.limiter:
             try:
                 posts, display_name = await FetchOrchestrator.get_posts(
                     reddit=self.reddit,
@@ -166,6 +257,7 @@ class MediaPostFetcher:
                     media_type=media_type,
                     media_count=target_count,
                     processed_urls=processed_urls,
+                    processed_post_ids=processed_post_ids,
                 )
                 filtered = await filterer.filter(posts)
                 unique = await RedditPostFetcher.filter_duplicates(filtered, processed_post_ids)
@@ -1,6 +1,7 @@
 # redditcommand/filter_posts.py
 
-from random import sample
+from random import randrange
+from collections import Counter
 from typing import List, Optional, Set
 from asyncpraw.models import Submission
 
@@ -18,11 +19,14 @@ class MediaPostFilter:
         media_type: Optional[str] = None,
         media_count: int = 1,
         processed_urls: Optional[Set[str]] = None,
+        processed_post_ids: Optional[Set[str]] = None,
     ):
         self.subreddit_name = subreddit_name
         self.media_type = media_type
         self.media_count = media_count
-        self.processed_urls = processed_urls or set()
+        self.processed_urls = processed_urls if processed_urls is not None else set()
+        # Ids already taken by another subreddit task; skipped before sampling so they never use up a slot
+        self.processed_post_ids = processed_post_ids if processed_post_ids is not None else set()
 
     async def filter(self, posts: List[Submission]) -> List[Submission]:
         logger.info(f"Filtering r/{self.subreddit_name} | Total posts: {len(posts)}")
@@ -30,29 +34,34 @@ class MediaPostFilter:
             logger.warning(f"No posts to filter in r/{self.subreddit_name}")
             return []
 
-        skipped = {
-            SkipReasons.NON_MEDIA: 0,
-            SkipReasons.BLACKLISTED: 0,
-            SkipReasons.PROCESSED: 0,
-            SkipReasons.GFYCAT: 0,
-            SkipReasons.WRONG_TYPE: 0
-        }
-        filtered = []
+        skipped = Counter(dict.fromkeys(SkipReasons.all(), 0))
+        selected: List[Submission] = []
+        matched = 0
 
         for post in posts:
+            if post.id in self.processed_post_ids:
+                skipped[SkipReasons.PROCESSED] += 1
+                continue
             reason = FilterUtils.should_skip(post, self.processed_urls, self.media_type)
             if reason:
                 skipped[reason] += 1
+                continue
+
+            await FilterUtils.attach_metadata(post)
+            matched += 1
+            # Reservoir sampling: uniform pick of media_count posts without keeping every match
+            if len(selected) < self.media_count:
+                selected.append(post)
             else:
-                await FilterUtils.attach_metadata(post)
-                filtered.append(post)
+                j = randrange(matched)
+                if j < self.media_count:
+                    selected[j] = post
 
         FilterUtils.log_skips(skipped)
 
-        if not filtered:
+        if not matched:
             logger.info(f"No matching {self.media_type or 'media'} posts in r/{self.subreddit_name}")
             return []
 
-        selected = sample(filtered, min(self.media_count, len(filtered)))
         logger.info(f"Selected {len(selected)} post(s) from r/{self.subreddit_name}")
         return selected
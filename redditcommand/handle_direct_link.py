@@ -18,9 +18,13 @@ from redditcommand.utils.tempfile_utils import TempFileManager
 from redditcommand.utils.media_utils import MediaDownloader
 from redditcommand.utils.reddit_video_resolver import RedditVideoResolver
 from redditcommand.utils.session import GlobalSession
+from redditcommand.utils.ytdlp_runner import YtDlpRunner
 
 logger = LogManager.setup_main_logger()
 
+_DIRECT_MEDIA_EXTS = frozenset({"jpg", "jpeg", "png", "gif", "gifv", "mp4"})
+_YTDLP_DOMAINS = ("kick.com", "twitch.tv", "youtube.com", "youtu.be", "x.com", "twitter.com")
+
 
 class MediaLinkResolver:
     def __init__(self):
@@ -78,9 +82,9 @@ class MediaLinkResolver:
                 return await self._streamable(media_url, post)
             if "redgifs.com" in media_url:
                 return await self._redgifs(media_url, post)
-            if any(domain in media_url for domain in ["kick.com", "twitch.tv", "youtube.com", "youtu.be", "x.com", "twitter.com"]):
+            if any(domain in media_url for domain in _YTDLP_DOMAINS):
                 return await self._yt_dlp(media_url, post)
-            if media_url.lower().endswith((".jpg", ".jpeg", ".png", ".gif", ".mp4")):
+            if media_url.rpartition(".")[2].lower() in _DIRECT_MEDIA_EXTS:
                 return media_url
 
             logger.warning(f"Unsupported URL format: {media_url}")
@@ -119,7 +123,7 @@ class MediaLinkResolver:
             }
 
         async def _probe_audio_with_headers(url: str) -> bool:
-            # Try HEAD first, then tiny GET if origin dislikes HEAD
+            # Try HEAD first, then a one-byte ranged GET if origin dislikes HEAD
             try:
                 async with self.session.head(url, headers=_headers(), timeout=5) as resp:
                     if resp.status == 200:
@@ -127,25 +131,13 @@ class MediaLinkResolver:
             except Exception:
                 pass
             try:
-                async with self.session.get(url, headers=_headers(), timeout=5) as resp:
-                    return resp.status == 200
+                async with self.session.get(url, headers={**_headers(), "Range": "bytes=0-0"}, timeout=5) as resp:
+                    return resp.status in (200, 206)
             except Exception:
                 return False
 
         async def _download_audio_with_headers(url: str, out_path: str) -> Optional[str]:
-            try:
-                async with self.session.get(url, headers=_headers()) as resp:
-                    if resp.status != 200:
-                        return None
-                    with open(out_path, "wb") as f:
-                        while True:
-                            chunk = await resp.content.read(1024 * 1024)
-                            if not chunk:
-                                break
-                            f.write(chunk)
-                return out_path
-            except Exception:
-                return None
+            return await MediaDownloader.download_file(url, out_path, session=self.session, headers=_headers())
 
         # --- main flow ---
         try:
@@ -182,8 +174,8 @@ class MediaLinkResolver:
                     muxed = await AVMuxer.mux_av(video_tmp, a_path, out_path)
                     if muxed:
                         try:
-                            TempFileManager.cleanup_file(video_tmp)
-                            TempFileManager.cleanup_file(audio_tmp)
+                            await TempFileManager.acleanup(video_tmp)
+                            await TempFileManager.acleanup(audio_tmp)
                         except Exception:
                             pass
                         return out_path
@@ -200,8 +192,8 @@ class MediaLinkResolver:
                         except Exception:
                             out_path = ytdlp_path
                     try:
-                        TempFileManager.cleanup_file(video_tmp)
-                        TempFileManager.cleanup_file(audio_tmp)
+                        await TempFileManager.acleanup(video_tmp)
+                        await TempFileManager.acleanup(audio_tmp)
                     except Exception:
                         pass
                     return out_path
@@ -217,7 +209,7 @@ class MediaLinkResolver:
                 return video_tmp
 
             try:
-                TempFileManager.cleanup_file(audio_tmp)
+                await TempFileManager.acleanup(audio_tmp)
             except Exception:
                 pass
 
@@ -350,15 +342,14 @@ class MediaLinkResolver:
 
     async def _download_with_ytdlp(self, url: str, post_id: str) -> Optional[str]:
         """
-        Download a video with yt-dlp to a temp directory using an output template.
-        Forces an mp4 merge/remux and handles timeouts. Returns the final file path
+        Download a video with yt-dlp (in a YtDlpRunner worker) to a temp directory using
+        an output template. Forces an mp4 merge/remux and handles timeouts. Returns the final file path
         or None on failure.
         """
         temp_dir = TempFileManager.create_temp_dir("ytdlp_video_")
         output_tpl = os.path.join(temp_dir, f"reddit_{post_id}.%(ext)s")
 
-        command = [
-            "yt-dlp",
+        args = [
             "--quiet",
             "--no-warnings",
             "--no-part",
@@ -367,33 +358,26 @@ class MediaLinkResolver:
             "--no-check-certificate",
             "--format", "bestvideo[ext=mp4]+bestaudio[ext=m4a]/mp4",
             "--merge-output-format", "mp4",
+            "--remux-video", "mp4",
+            "--concurrent-fragments", str(RedditVideoConfig.YTDLP_CONCURRENT_FRAGMENTS),
             "--output", output_tpl,
             url,
         ]
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
             try:
-                _, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                returncode, err = await YtDlpRunner.run(
+                    args,
                     timeout=getattr(RedditVideoConfig, "YTDLP_TIMEOUT", 600),
                 )
             except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
                 logger.error("yt-dlp timed out")
-                TempFileManager.cleanup_file(temp_dir)
+                await TempFileManager.acleanup(temp_dir)
                 return None
 
-            if process.returncode != 0:
-                err = (stderr.decode(errors="ignore") or "").strip()
-                logger.error(f"yt-dlp failed: {err}")
-                TempFileManager.cleanup_file(temp_dir)
+            if returncode != 0:
+                logger.error(f"yt-dlp failed: {err.strip()}")
+                await TempFileManager.acleanup(temp_dir)
                 return None
 
             candidates = [
@@ -405,15 +389,14 @@ class MediaLinkResolver:
                     return cand
 
             prefix = f"reddit_{post_id}."
-            for name in os.listdir(temp_dir):
-                if name.startswith(prefix):
-                    path = os.path.join(temp_dir, name)
-                    if os.path.isfile(path):
-                        return path
+            with os.scandir(temp_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.is_file():
+                        return entry.path
 
             logger.error("yt-dlp succeeded but no output file was found")
         except Exception as e:
             logger.error(f"yt-dlp exception: {e}", exc_info=True)
 
-        TempFileManager.cleanup_file(temp_dir)
+        await TempFileManager.acleanup(temp_dir)
         return None
@@ -3,12 +3,13 @@
 import asyncio
 import aiohttp
 import os
+import random
 import urllib.parse
 from urllib.parse import urlsplit, urlunsplit
 
-from typing import Optional
+from typing import Optional, Tuple
 from telegram import Update
-from telegram.error import TimedOut
+from telegram.error import TimedOut, BadRequest
 from asyncpraw import Reddit
 from asyncpraw.models import Submission
 
@@ -40,12 +41,12 @@ class MediaProcessor:
 
     async def _maybe_notify_compression(self, file_path: str):
         try:
-            size_mb = os.path.getsize(file_path) / (1024 * 1024)
+            size_mb = await asyncio.to_thread(os.path.getsize, file_path) / (1024 * 1024)
         except Exception:
             return
 
-        # Notify only when it’s larger than the Telegram target limit but <= 100MB (our compressor hard cap)
-        if size_mb > MediaConfig.MAX_FILE_SIZE_MB and size_mb <= 100:
+        # Notify only when it’s larger than the Telegram target limit but within our compressor hard cap
+        if size_mb > MediaConfig.MAX_FILE_SIZE_MB and size_mb <= MediaConfig.MAX_DOWNLOAD_SIZE_MB:
             msg = f"Large file ({size_mb:.1f} MB). Compressing before sending..."
             try:
                 # Support both shapes: update.message.reply_text(...) and update.reply_text(...)
@@ -56,14 +57,71 @@ class MediaProcessor:
                 logger.warning(f"Failed to send compression notice: {e}")
 
     async def process_batch(self, media_list, include_comments, include_flair, include_title):
-        tasks = [
-            self.process_single(media, include_comments, include_flair, include_title)
-            for media in media_list
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        return [result for result in results if isinstance(result, Submission)]
+        """
+        Two-stage pipeline: downloaders resolve and fetch posts into a bounded queue while
+        uploaders send finished files to Telegram, so ingress and egress overlap.
+        media_list may be an async iterable; each post is picked up as soon as it arrives.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MediaConfig.UPLOAD_CONCURRENCY)
+        download_slots = asyncio.Semaphore(MediaConfig.DOWNLOAD_CONCURRENCY)
+        sent = []
+
+        async def download(media):
+            async with download_slots:
+                try:
+                    prepared = await self.prepare_single(media, include_comments, include_flair, include_title)
+                except Exception as e:
+                    logger.error(f"Media task failed: {e}", exc_info=True)
+                    return
+                if prepared:
+                    await queue.put((media, *prepared))
+
+        async def upload():
+            while True:
+                media, file_path, caption = await queue.get()
+                try:
+                    if await self.upload_media(file_path, self.update, caption) and isinstance(media, Submission):
+                        sent.append(media)
+                except Exception as e:
+                    logger.error(f"Upload task failed: {e}", exc_info=True)
+                finally:
+                    queue.task_done()
+
+        uploaders = [asyncio.create_task(upload()) for _ in range(MediaConfig.UPLOAD_CONCURRENCY)]
+        downloads = []
+        try:
+            if hasattr(media_list, "__aiter__"):
+                async for media in media_list:
+                    downloads.append(asyncio.create_task(download(media)))
+            else:
+                downloads = [asyncio.create_task(download(media)) for media in media_list]
+            await asyncio.gather(*downloads)
+            await queue.join()
+        finally:
+            for task in downloads + uploaders:
+                task.cancel()
+            await asyncio.gather(*downloads, *uploaders, return_exceptions=True)
+        return sent
 
     async def process_single(self, media, include_comments=False, include_flair=False, include_title=False):
+        try:
+            prepared = await self.prepare_single(media, include_comments, include_flair, include_title)
+            if not prepared:
+                return None
+
+            file_path, caption = prepared
+            if await self.upload_media(file_path, self.update, caption):
+                return media
+
+        except Exception as e:
+            logger.error(f"Error processing media {media.url}: {e}", exc_info=True)
+        return None
+
+    async def prepare_single(self, media, include_comments=False, include_flair=False, include_title=False) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Build the caption and resolve, download and validate the media.
+        Returns (file_path, caption) ready for upload, or None.
+        """
         if not media.url:
             logger.warning("Media URL is missing or invalid.")
             return None
@@ -74,12 +132,14 @@ class MediaProcessor:
             if not resolved_url:
                 return None
 
+            if await self.can_send_by_url(resolved_url):
+                # Telegram fetches it server-side; upload_media falls back to downloading
+                return resolved_url, caption
+
             file_path = await self.download_and_validate_media(resolved_url, media.id)
             if not file_path:
                 return None
-
-            if await self.upload_media(file_path, self.update, caption):
-                return media
+            return file_path, caption
 
         except Exception as e:
             logger.error(f"Error processing media {media.url}: {e}", exc_info=True)
@@ -103,7 +163,7 @@ class MediaProcessor:
             # Reddit gallery (by URL; your existing approach)
             if "gallery" in media_url:
                 gallery_id = media_url.rstrip("/").split("/")[-1]
-                return await MediaUtils.resolve_reddit_gallery(gallery_id, self.reddit)
+                return await MediaUtils.resolve_reddit_gallery(gallery_id, self.reddit, post=post)
 
             resolver = MediaLinkResolver()
             await resolver.init()
@@ -118,6 +178,13 @@ class MediaProcessor:
             logger.error(f"Error resolving media URL for post {getattr(post, 'id', '?')}: {e}", exc_info=True)
             return None
 
+    async def can_send_by_url(self, resolved_url: str) -> bool:
+        limit_mb = MediaSender.url_upload_limit_mb(resolved_url)
+        if limit_mb is None:
+            return False
+        size = await MediaDownloader.content_length(resolved_url, self.session)
+        return size is not None and 0 < size <= limit_mb * 1024 * 1024
+
     async def download_and_validate_media(self, resolved_url: str, post_id: Optional[str] = None) -> Optional[str]:
         file_path = await self.download_file(resolved_url, post_id)
         if not file_path:
@@ -130,14 +197,12 @@ class MediaProcessor:
             return final_path
 
         logger.warning(f"File too large after download: {file_path}")
-        TempFileManager.cleanup_file(file_path)
+        await TempFileManager.acleanup(file_path)
         return None
 
     async def download_file(self, resolved_url: str, post_id: Optional[str]) -> Optional[str]:
-        if os.path.isfile(resolved_url):
-            return resolved_url if await MediaUtils.validate_file(resolved_url) else None
-
         if not resolved_url.startswith(("http://", "https://")):
+            # Already a local file; validate_file stats it once
             return resolved_url if await MediaUtils.validate_file(resolved_url) else None
 
         temp_dir = TempFileManager.create_temp_dir("reddit_media_")
@@ -147,14 +212,29 @@ class MediaProcessor:
         file_path = os.path.join(temp_dir, f"reddit_{final_id}{ext}")
 
         file_path = await MediaDownloader.download_file(resolved_url, file_path)
-        if file_path and file_path.endswith(".gif"):
+        if file_path and file_path.endswith((".gif", ".gifv")):
             converted = await MediaUtils.convert_gif_to_mp4(file_path)
-            TempFileManager.cleanup_file(file_path)
+            await TempFileManager.acleanup(file_path)
             return converted
 
         return file_path
 
     async def upload_media(self, file_path: str, target, caption: Optional[str]) -> bool:
+        if file_path.startswith(("http://", "https://")):
+            try:
+                await MediaSender.send_url(file_path, target, caption=caption)
+                logger.info(f"Successfully sent media by URL: {file_path}")
+                return True
+            except TimedOut:
+                logger.warning(f"Timed out sending media by URL: {file_path}")
+                return True
+            except Exception as e:
+                logger.info(f"Telegram could not fetch {file_path} ({e}); uploading it instead")
+
+            file_path = await self.download_and_validate_media(file_path)
+            if not file_path:
+                return False
+
         handler = MediaSender.determine_type_and_send(file_path)
         if not handler:
             logger.warning(f"Unsupported media type: {file_path}")
@@ -164,15 +244,23 @@ class MediaProcessor:
             try:
                 await handler(file_path, target, caption=caption)
                 logger.info(f"Successfully sent media: {file_path}")
-                TempFileManager.cleanup_file(file_path)
+                await TempFileManager.acleanup(file_path)
                 return True
             except TimedOut:
                 logger.warning(f"Timed out on attempt {attempt + 1} for file: {file_path}")
-                TempFileManager.cleanup_file(file_path)
+                await TempFileManager.acleanup(file_path)
                 return True
+            except BadRequest as e:
+                # Telegram rejected the file itself; re-uploading will not help
+                logger.error(f"Upload rejected, not retrying: {e}")
+                break
             except Exception as e:
                 logger.error(f"Upload failed on attempt {attempt + 1}: {e}", exc_info=True)
 
-        logger.error(f"Failed to send media after {RetryConfig.RETRY_ATTEMPTS} attempts: {file_path}")
-        TempFileManager.cleanup_file(file_path)
+            if attempt + 1 < RetryConfig.RETRY_ATTEMPTS:
+                delay = min(RetryConfig.UPLOAD_BACKOFF_SECONDS * 2 ** attempt, RetryConfig.MAX_UPLOAD_BACKOFF_SECONDS)
+                await asyncio.sleep(delay + random.uniform(0, 1))
+
+        logger.error(f"Failed to send media after {attempt + 1} attempt(s): {file_path}")
+        await TempFileManager.acleanup(file_path)
         return False
@@ -10,6 +10,8 @@ from asyncpraw import Reddit
 from redditcommand.utils.log_manager import LogManager
 from redditcommand.config import RedditClientManager, MediaConfig, RetryConfig, RedditDefaults, PipelineConfig
 from redditcommand.utils.pipeline_utils import PipelineHelper
+from redditcommand.utils.dedup import UrlDedup
+from redditcommand.utils.rate_limiter import RedditRateLimiter
 from redditcommand.fetch import MediaPostFetcher
 from redditcommand.media_handler import MediaProcessor
 
@@ -43,7 +45,7 @@ class RedditMediaPipeline:
         self.include_title = include_title
         self.semaphore_limit = fetch_semaphore_limit
 
-        self.processed_urls = set()
+        self.processed_urls = UrlDedup()
         self.successfully_sent_posts = []
         self.total_processed = 0
         self.backoff = PipelineConfig.INITIAL_BACKOFF_SECONDS
@@ -51,6 +53,11 @@ class RedditMediaPipeline:
         self.reddit: Optional[Reddit] = None
         self.fetcher: Optional[MediaPostFetcher] = None
 
+    async def _stream(self, fetched: asyncio.Queue):
+        while (post := await fetched.get()) is not None:
+            self.processed_urls.add(post.url)
+            yield post
+
     async def run(self):
         logger.info(f"Starting pipeline for subreddits: {', '.join(self.subreddit_names)}")
 
@@ -63,7 +70,7 @@ class RedditMediaPipeline:
                 logger.warning("No valid subreddits to proceed with.")
                 return
 
-            self.fetcher = MediaPostFetcher(asyncio.Semaphore(self.semaphore_limit))
+            self.fetcher = MediaPostFetcher(RedditRateLimiter(self.reddit, max_concurrency=self.semaphore_limit))
             await self.fetcher.init_client()
 
             async with MediaProcessor(self.reddit, self.update) as processor:
@@ -73,7 +80,9 @@ class RedditMediaPipeline:
                         break
 
                     logger.info(f"Attempt {attempt}: fetching {remaining} post(s)")
-                    posts = await self.fetcher.fetch_from_subreddits(
+                    # Posts are handed to the processor as each subreddit finishes filtering
+                    fetched: asyncio.Queue = asyncio.Queue()
+                    fetch_task = asyncio.create_task(self.fetcher.fetch_from_subreddits(
                         subreddit_names=valid_subreddits,
                         search_terms=self.search_terms,
                         sort=self.sort,
@@ -82,28 +91,37 @@ class RedditMediaPipeline:
                         media_count=remaining,
                         update=self.update,
                         processed_urls=self.processed_urls,
-                    )
+                        on_posts=fetched.put_nowait,
+                    ))
+                    fetch_task.add_done_callback(lambda _: fetched.put_nowait(None))
+
+                    try:
+                        sent = await processor.process_batch(
+                            self._stream(fetched),
+                            include_comments=self.include_comments,
+                            include_flair=self.include_flair,
+                            include_title=self.include_title
+                        )
+                    finally:
+                        fetch_task.cancel()
+                    posts = await fetch_task
 
-                    if not posts:
-                        sleep_duration = self.backoff * random.uniform(0.5, 1.5)
-                        logger.warning(f"No new media found. Retrying after {sleep_duration:.2f}s.")
-                        await asyncio.sleep(sleep_duration)
-                        self.backoff = min(self.backoff * PipelineConfig.BACKOFF_MULTIPLIER, PipelineConfig.MAX_BACKOFF_SECONDS)
-                        continue
+                    self.successfully_sent_posts.extend(sent)
+                    self.total_processed += len(sent)
 
-                    self.processed_urls.update(post.url for post in posts)
                     if len(self.processed_urls) > PipelineConfig.MAX_PROCESSED_URLS:
                         logger.warning("Processed URL cache exceeded 10k entries. Resetting.")
                         self.processed_urls.clear()
 
-                    sent = await processor.process_batch(
-                        posts,
-                        include_comments=self.include_comments,
-                        include_flair=self.include_flair,
-                        include_title=self.include_title
-                    )
-                    self.successfully_sent_posts.extend(sent)
-                    self.total_processed += len(sent)
+                    if not posts:
+                        if attempt == RetryConfig.RETRY_ATTEMPTS:
+                            # Last attempt: nothing left to wait for
+                            logger.warning("No new media found.")
+                            break
+                        sleep_duration = self.backoff * random.uniform(0.5, 1.5)
+                        logger.warning(f"No new media found. Retrying after {sleep_duration:.2f}s.")
+                        await asyncio.sleep(sleep_duration)
+                        self.backoff = min(self.backoff * PipelineConfig.BACKOFF_MULTIPLIER, PipelineConfig.MAX_BACKOFF_SECONDS)
 
             await PipelineHelper.notify_completion(
                 self.update,
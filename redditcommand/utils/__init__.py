@@ -16,6 +16,7 @@ from .fetch_utils import SubredditFetcher, RedditPostFetcher, RandomSearch, Fetc
 # Filtering and state
 from .filter_utils import FilterUtils
 from .file_state_utils import FollowedUserStore
+from .dedup import UrlDedup
 
 # Pipeline helpers
 from .pipeline_utils import PipelineHelper
@@ -10,6 +10,16 @@ from redditcommand.utils.log_manager import LogManager
 
 logger = LogManager.setup_main_logger()
 
+_TIME_FILTERS = frozenset({"all", "year", "month", "week", "day"})
+_MEDIA_TYPES = frozenset({"image", "video"})
+# Caption flags and the caption parts each one switches on
+_CAPTION_FLAGS = {
+    "-a": ("comments", "flair", "title"),
+    "-c": ("comments",),
+    "-f": ("flair",),
+    "-t": ("title",),
+}
+
 
 class CommandParser:
     @staticmethod
@@ -43,8 +53,10 @@ class CommandParser:
 
     @staticmethod
     def extract_time_filter(args: List[str]) -> Tuple[Optional[str], List[str]]:
-        time_filter = args[0].lower() if args[0].lower() in ["all", "year", "month", "week", "day"] else None
-        return time_filter, args[1:] if time_filter else args
+        first = args[0].lower()
+        if first in _TIME_FILTERS:
+            return first, args[1:]
+        return None, args
 
     @staticmethod
     def parse_subreddits(arg: str) -> List[str]:
@@ -60,32 +72,32 @@ class CommandParser:
         media_count = 1
         media_type = None
         search_terms = []
-        include_comments = False
-        include_flair = False
-        include_title = False
+        caption_parts = set()
 
         for arg in args:
             lowered = arg.lower()
-            if lowered == "-a":
-                include_comments = include_flair = include_title = True
-            elif lowered == "-c":
-                include_comments = True
-            elif lowered == "-f":
-                include_flair = True
-            elif lowered == "-t":
-                include_title = True
+            parts = _CAPTION_FLAGS.get(lowered)
+            if parts:
+                caption_parts.update(parts)
             elif lowered.isdigit():
                 count = int(lowered)
                 if count <= MediaConfig.MAX_MEDIA_COUNT:
                     media_count = count
                 else:
                     raise ValueError(Messages.MAX_COUNT_EXCEEDED_MESSAGE)
-            elif lowered in ["image", "video"]:
+            elif lowered in _MEDIA_TYPES:
                 media_type = lowered
             else:
                 search_terms.append(lowered)
 
-        return media_count, media_type, search_terms, include_comments, include_flair, include_title
+        return (
+            media_count,
+            media_type,
+            search_terms,
+            "comments" in caption_parts,
+            "flair" in caption_parts,
+            "title" in caption_parts,
+        )
 
 
 class CommandUtils:
@@ -4,7 +4,9 @@ import os
 import asyncio
 from typing import Optional
 
+from redditcommand.config import MediaConfig
 from redditcommand.utils.tempfile_utils import TempFileManager
+from redditcommand.utils.ffmpeg_runner import FFmpegRunner
 from redditcommand.utils.log_manager import LogManager
 
 logger = LogManager.setup_main_logger()
@@ -20,14 +22,17 @@ class Compressor:
           final_path to a file that is <= max_size_mb, or None if it fails.
         The original file is not deleted here. Caller owns cleanup.
         """
-        if not os.path.exists(file_path):
+        size = await asyncio.to_thread(TempFileManager.file_size, file_path)
+        if size is None:
             logger.warning(f"Validation failed: File does not exist: {file_path}")
             return None
 
-        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        size_mb = size / (1024 * 1024)
 
-        if size_mb > 100:
-            logger.warning(f"Skipping file: too large to process ({size_mb:.2f} MB > 100 MB): {file_path}")
+        if size_mb > MediaConfig.MAX_DOWNLOAD_SIZE_MB:
+            logger.warning(
+                f"Skipping file: too large to process ({size_mb:.2f} MB > {MediaConfig.MAX_DOWNLOAD_SIZE_MB} MB): {file_path}"
+            )
             return None
 
         if size_mb <= max_size_mb:
@@ -46,11 +51,66 @@ class Compressor:
             target_size_mb=max_size_mb
         )
         if final is None:
-            TempFileManager.cleanup_file(output_path)
-            TempFileManager.cleanup_dir(temp_dir)
+            await TempFileManager.acleanup(output_path)
+            await TempFileManager.acleanup(temp_dir)
             return None
         return final
 
+    @staticmethod
+    async def _two_pass(
+        input_path: str,
+        output_path: str,
+        target_size_mb: int,
+        duration: float,
+        timeout_seconds: int,
+    ) -> bool:
+        total_kbps = target_size_mb * 8192 * MediaConfig.TWO_PASS_SIZE_MARGIN / duration
+        video_kbps = int(total_kbps - MediaConfig.COMPRESS_AUDIO_KBPS)
+        if video_kbps < MediaConfig.TWO_PASS_MIN_VIDEO_KBPS:
+            logger.info(f"Two-pass skipped: {duration:.0f}s clip leaves only {video_kbps}kbps for video")
+            return False
+
+        logger.info(f"Two-pass compression for {input_path} at {video_kbps}kbps ({duration:.1f}s)")
+        passlog = os.path.splitext(output_path)[0] + "_2pass"
+        common = [
+            "-map", "0:v:0?",
+            "-vcodec", "libx264", "-b:v", f"{video_kbps}k", "-preset", "fast",
+            "-vf", "scale='min(1280,iw)':-2",
+            "-pix_fmt", "yuv420p",
+            "-passlogfile", passlog,
+        ]
+        first = ["ffmpeg", "-y", "-i", input_path, *common, "-pass", "1", "-an", "-f", "null", os.devnull]
+        second = [
+            "ffmpeg", "-y", "-i", input_path, *common, "-pass", "2",
+            "-map", "0:a:0?", "-acodec", "aac", "-b:a", f"{MediaConfig.COMPRESS_AUDIO_KBPS}k",
+            "-movflags", "+faststart",
+            output_path,
+        ]
+
+        try:
+            for cmd in (first, second):
+                returncode, stderr = await FFmpegRunner.run(cmd, timeout=timeout_seconds)
+                if returncode != 0:
+                    logger.error(f"Two-pass compression failed: {stderr.decode(errors='ignore')[-500:]}")
+                    await TempFileManager.acleanup(output_path)
+                    return False
+        except asyncio.TimeoutError:
+            logger.error("Two-pass compression timed out")
+            await TempFileManager.acleanup(output_path)
+            return False
+        finally:
+            for suffix in ("-0.log", "-0.log.mbtree"):
+                await TempFileManager.acleanup(passlog + suffix)
+
+        new_size = await asyncio.to_thread(os.path.getsize, output_path) / (1024 * 1024)
+        if new_size <= target_size_mb:
+            logger.info(f"Compression successful: {new_size:.2f} MB <= {target_size_mb} MB")
+            return True
+
+        logger.warning(f"Two-pass result still too large: {new_size:.2f} MB > {target_size_mb} MB")
+        await TempFileManager.acleanup(output_path)
+        return False
+
     @staticmethod
     async def compress(
         input_path: str,
@@ -60,9 +120,18 @@ class Compressor:
         timeout_seconds: int = 600,
     ) -> Optional[str]:
         """
-        Try up to max_attempts to produce a file at output_path that is <= target_size_mb.
+        Produce a file at output_path that is <= target_size_mb. A two-pass encode at the
+        bitrate the target size allows for the clip's duration usually lands in one go;
+        when the duration is unknown or that encode misses, CRF encoding is tried
+        (up to max_attempts times without a two-pass result, once after one).
         Returns output_path on success, or None on failure.
         """
+        duration = await FFmpegRunner.probe_duration(input_path)
+        if duration:
+            if await Compressor._two_pass(input_path, output_path, target_size_mb, duration, timeout_seconds):
+                return output_path
+            max_attempts = 1
+
         crf = 28
         max_bitrate = 2500  # kbps, for later attempts only
 
@@ -79,7 +148,7 @@ class Compressor:
                     "-vcodec", "libx264", "-crf", str(crf), "-preset", "fast",
                     "-vf", "scale='min(1280,iw)':-2",
                     "-pix_fmt", "yuv420p",
-                    "-acodec", "aac", "-b:a", "96k",
+                    "-acodec", "aac", "-b:a", f"{MediaConfig.COMPRESS_AUDIO_KBPS}k",
                     "-movflags", "+faststart",
                 ]
 
@@ -91,30 +160,25 @@ class Compressor:
 
                 cmd.append(output_path)
 
-                proc = await asyncio.create_subprocess_exec(
-                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
                 try:
-                    _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_seconds)
+                    returncode, stderr = await FFmpegRunner.run(cmd, timeout=timeout_seconds)
                 except asyncio.TimeoutError:
-                    proc.kill()
-                    await proc.wait()
                     logger.error("Compression timed out")
-                    TempFileManager.cleanup_file(output_path)
+                    await TempFileManager.acleanup(output_path)
                     continue
 
-                if proc.returncode != 0:
+                if returncode != 0:
                     logger.error(f"Compression failed: {stderr.decode()}")
-                    TempFileManager.cleanup_file(output_path)
+                    await TempFileManager.acleanup(output_path)
                     continue
 
-                new_size = os.path.getsize(output_path) / (1024 * 1024)
+                new_size = await asyncio.to_thread(os.path.getsize, output_path) / (1024 * 1024)
                 if new_size <= target_size_mb:
                     logger.info(f"Compression successful: {new_size:.2f} MB <= {target_size_mb} MB")
                     return output_path
                 else:
                     logger.warning(f"Still too large: {new_size:.2f} MB > {target_size_mb} MB")
-                    TempFileManager.cleanup_file(output_path)
+                    await TempFileManager.acleanup(output_path)
 
             except Exception as e:
                 logger.error(f"Compression error (attempt {attempt + 1}): {e}", exc_info=True)
@@ -0,0 +1,46 @@
+# redditcommand/utils/dedup.py
+
+import functools
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from redditcommand.config import MediaValidationConfig
+
+_TRACKING_PARAMS = frozenset({"ref", "ref_source", "ref_campaign", "share_id", "context", "si", "fbclid", "gclid"})
+
+
+@functools.lru_cache(maxsize=MediaValidationConfig.URL_CACHE_SIZE)
+def canonical_url(url: str) -> str:
+    """
+    Drop what does not change the resource (fragment, tracking params, host case)
+    so reposts of the same media compare equal. Other params are kept:
+    preview.redd.it URLs are signed with them.
+    """
+    parts = urlsplit(url.strip())
+    query = parts.query
+    if query:
+        kept = [
+            (k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+            if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+        ]
+        query = urlencode(kept)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+class UrlDedup(set):
+    """
+    Exact set of the URLs processed by one pipeline run, compared in canonical
+    form (see canonical_url). A run handles at most a few hundred URLs, so a
+    plain set is both the smallest and the only false-positive-free option.
+    """
+
+    def add(self, url: str) -> None:
+        if url:
+            super().add(canonical_url(url))
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return bool(url) and super().__contains__(canonical_url(url))
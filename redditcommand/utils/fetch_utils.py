@@ -3,12 +3,25 @@ import random
 from typing import List, Optional, Set, Tuple
 from asyncpraw.models import Subreddit, Submission
 
-from redditcommand.config import RedditClientManager, MediaConfig, Messages
+from redditcommand.config import RedditClientManager, MediaConfig, Messages, InflightConfig
+from redditcommand.utils.inflight import coalesce
 from redditcommand.utils.log_manager import LogManager
 
 logger = LogManager.setup_main_logger()
 
 
+def _subreddit_key(subreddit_name: str, *args, **kwargs):
+    name = subreddit_name.strip().lower()
+    # Random picks must stay independent per call
+    return None if not name or name == "random" else ("subreddit", name)
+
+
+def _listing_key(subreddit: Subreddit, *args, **kwargs):
+    return (str(subreddit.display_name).lower(),) + tuple(
+        tuple(a) if isinstance(a, list) else a for a in args
+    ) + tuple(sorted(kwargs.items()))
+
+
 async def _safe_reply(update, message: str) -> None:
     target = getattr(update, "message", update)
     if hasattr(target, "reply_text"):
@@ -21,6 +34,24 @@ async def _safe_reply(update, message: str) -> None:
 
 
 class SubredditFetcher:
+    @staticmethod
+    @coalesce(key=_subreddit_key, ttl=InflightConfig.SUBREDDIT_TTL_SECONDS)
+    async def load(subreddit_name: str, reddit=None) -> Subreddit:
+        """
+        Load a subreddit handle, through the given client or the shared one. Successful
+        loads are cached by name for InflightConfig.SUBREDDIT_TTL_SECONDS; failures raise
+        and are not cached.
+        """
+        reddit = reddit or await RedditClientManager.get_client()
+        subreddit = await reddit.subreddit(subreddit_name)
+        await subreddit.load()
+        logger.info(f"Loaded subreddit: r/{subreddit_name}")
+        return subreddit
+
+    @staticmethod
+    def evict(subreddit_name: str) -> None:
+        SubredditFetcher.load.cache_pop(subreddit_name)
+
     @staticmethod
     async def fetch_and_validate(subreddit_name: str, update) -> Optional[Subreddit]:
         if subreddit_name.strip().lower() == "random":
@@ -31,11 +62,7 @@ class SubredditFetcher:
             return None
 
         try:
-            reddit = await RedditClientManager.get_client()
-            subreddit = await reddit.subreddit(subreddit_name)
-            await subreddit.load()
-            logger.info(f"Loaded subreddit: r/{subreddit_name}")
-            return subreddit
+            return await SubredditFetcher.load(subreddit_name)
         except Exception as e:
             return await SubredditFetcher._handle_error(e, subreddit_name, update)
 
@@ -90,7 +117,14 @@ class RedditPostFetcher:
         return all((term.lower() in title) or (term.lower() in flair) for term in terms if term.strip())
 
     @staticmethod
-    async def search(subreddit: Subreddit, terms: List[str], sort: str, time_filter: Optional[str]) -> List[Submission]:
+    @coalesce(key=lambda *a, **k: ("search",) + _listing_key(*a, **k))
+    async def search(
+        subreddit: Subreddit,
+        terms: List[str],
+        sort: str,
+        time_filter: Optional[str],
+        limit: int = MediaConfig.POST_LIMIT,
+    ) -> List[Submission]:
         try:
             if not terms:
                 return [
@@ -98,7 +132,7 @@ class RedditPostFetcher:
                         query="",
                         sort=sort,
                         time_filter=time_filter or "all",
-                        limit=MediaConfig.POST_LIMIT,
+                        limit=limit,
                     )
                 ]
 
@@ -109,7 +143,7 @@ class RedditPostFetcher:
                     query=query,
                     sort=sort,
                     time_filter=time_filter or "all",
-                    limit=MediaConfig.POST_LIMIT,
+                    limit=limit,
                 )
             ]
 
@@ -127,16 +161,24 @@ class RedditPostFetcher:
 
         except Exception as e:
             logger.error(f"Search error: {e}", exc_info=True)
+            SubredditFetcher.evict(str(subreddit.display_name))
             return []
         
     @staticmethod
-    async def fetch_sorted(subreddit: Subreddit, sort: str, time_filter: Optional[str] = None) -> List[Submission]:
+    @coalesce(key=lambda *a, **k: ("sorted",) + _listing_key(*a, **k))
+    async def fetch_sorted(
+        subreddit: Subreddit,
+        sort: str,
+        time_filter: Optional[str] = None,
+        limit: int = MediaConfig.POST_LIMIT,
+    ) -> List[Submission]:
         try:
             if sort == "top" and time_filter:
-                return [post async for post in subreddit.top(time_filter=time_filter, limit=MediaConfig.POST_LIMIT)]
-            return [post async for post in subreddit.hot(limit=MediaConfig.POST_LIMIT)]
+                return [post async for post in subreddit.top(time_filter=time_filter, limit=limit)]
+            return [post async for post in subreddit.hot(limit=limit)]
         except Exception as e:
             logger.error(f"Error fetching sorted posts: {e}", exc_info=True)
+            SubredditFetcher.evict(str(subreddit.display_name))
             return []
 
     @staticmethod
@@ -157,19 +199,8 @@ class RandomSearch:
         try:
             if search_terms:
                 subreddit = await reddit.subreddit("all")
-                query = RedditPostFetcher._build_title_flair_and_query(search_terms)
-
-                results = [
-                    post async for post in subreddit.search(
-                        query=query,
-                        sort=sort,
-                        time_filter=time_filter or "all",
-                        limit=MediaConfig.POST_LIMIT,
-                    )
-                ]
-
-                filtered = [p for p in results if RedditPostFetcher._matches_all_terms(p, search_terms)]
-                return (filtered, subreddit) if filtered else ([], subreddit)
+                filtered = await RedditPostFetcher.search(subreddit, search_terms, sort, time_filter)
+                return filtered, subreddit
 
             # Fallback when no search terms
             subreddits = [sub async for sub in reddit.subreddits.popular(limit=100)]
@@ -205,3 +236,21 @@ class FetchOrchestrator:
 
         display_name = getattr(subreddit, "display_name", None)
         return posts, display_name
+
+    @staticmethod
+    async def get_combined_posts(
+        reddit,
+        subreddit_names: List[str],
+        search_terms,
+        sort,
+        time_filter,
+        limit: int = MediaConfig.COMBINED_POST_LIMIT,
+    ) -> List[Submission]:
+        """
+        Fetch one merged listing for several subreddits via Reddit's "a+b+c" multireddit syntax.
+        """
+        subreddit = await reddit.subreddit("+".join(subreddit_names))
+
+        if search_terms:
+            return await RedditPostFetcher.search(subreddit, search_terms, sort, time_filter, limit=limit)
+        return await RedditPostFetcher.fetch_sorted(subreddit, sort, time_filter, limit=limit)
@@ -0,0 +1,118 @@
+# redditcommand/utils/ffmpeg_runner.py
+
+import os
+import asyncio
+from typing import FrozenSet, List, Optional, Tuple
+
+from redditcommand.config import MediaConfig
+
+
+class FFmpegRunner:
+    """
+    Runs ffmpeg/ffprobe as an asyncio subprocess so the event loop keeps serving other work.
+    At most MediaConfig.FFMPEG_CONCURRENCY encodes run at once; an x264 encode already
+    uses every core, so a small fixed cap keeps parallel batches from contending.
+    Probes (ffprobe, the encoder listing) skip that cap.
+    """
+    _slots: Optional[asyncio.Semaphore] = None
+    _encoders: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def _get_slots(cls) -> asyncio.Semaphore:
+        if cls._slots is None:
+            cls._slots = asyncio.Semaphore(MediaConfig.FFMPEG_CONCURRENCY)
+        return cls._slots
+
+    @classmethod
+    async def run(cls, command: List[str], timeout: Optional[float] = None) -> Tuple[int, bytes]:
+        """
+        Returns (exit code, stderr). On timeout or cancellation the process is killed
+        and the exception propagates.
+        """
+        returncode, _, stderr = await cls._exec(command, timeout)
+        return returncode, stderr
+
+    @classmethod
+    async def probe_duration(cls, path: str) -> Optional[float]:
+        """Container duration in seconds via ffprobe, or None when it cannot be read."""
+        command = [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            path,
+        ]
+        try:
+            returncode, stdout, _ = await cls._exec(command, timeout=30, probe=True)
+            duration = float(stdout.decode(errors="ignore").strip())
+        except (asyncio.TimeoutError, OSError, ValueError):
+            return None
+        return duration if returncode == 0 and duration > 0 else None
+
+    @classmethod
+    async def probe_dimensions(cls, path: str) -> Optional[Tuple[int, int]]:
+        """Width and height of the first video stream from container metadata, or None."""
+        command = [
+            "ffprobe", "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height",
+            "-of", "csv=s=x:p=0",
+            path,
+        ]
+        try:
+            returncode, stdout, _ = await cls._exec(command, timeout=30, probe=True)
+            width, height = (int(v) for v in stdout.decode(errors="ignore").strip().split("x")[:2])
+        except (asyncio.TimeoutError, OSError, ValueError):
+            return None
+        return (width, height) if returncode == 0 and width and height else None
+
+    @classmethod
+    async def has_encoder(cls, name: str) -> bool:
+        """Whether this ffmpeg build lists the encoder. Probed once per process."""
+        if cls._encoders is None:
+            try:
+                returncode, stdout, _ = await cls._exec(["ffmpeg", "-hide_banner", "-encoders"], timeout=30, probe=True)
+            except (asyncio.TimeoutError, OSError):
+                returncode, stdout = 1, b""
+            names = (line.split() for line in stdout.decode(errors="ignore").splitlines())
+            cls._encoders = frozenset(parts[1] for parts in names if len(parts) > 1) if returncode == 0 else frozenset()
+        return name in cls._encoders
+
+    @classmethod
+    def drop_encoder(cls, name: str) -> None:
+        # Listed but unusable (e.g. no GPU or driver); stop trying it for this process
+        if cls._encoders:
+            cls._encoders = cls._encoders - {name}
+
+    @classmethod
+    async def _exec(cls, command: List[str], timeout: Optional[float], probe: bool = False) -> Tuple[int, bytes, bytes]:
+        if probe:
+            # Probes take well under a second; behind two long encodes they would stall
+            # the upload path, and their timeout does not cover waiting for a slot
+            return await cls._spawn(command, timeout, nice=False)
+        async with cls._get_slots():
+            return await cls._spawn(command, timeout, nice=True)
+
+    @classmethod
+    async def _spawn(cls, command: List[str], timeout: Optional[float], nice: bool) -> Tuple[int, bytes, bytes]:
+        proc = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        if nice:
+            cls._lower_priority(getattr(proc, "pid", None))
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, stdout, stderr
+
+    @staticmethod
+    def _lower_priority(pid: Optional[int]) -> None:
+        # Set after spawn rather than via preexec_fn, which is unsafe with threads in the parent
+        if not pid or not MediaConfig.FFMPEG_NICENESS or not hasattr(os, "setpriority"):
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, MediaConfig.FFMPEG_NICENESS)
+        except OSError:
+            pass
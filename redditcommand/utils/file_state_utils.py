@@ -2,7 +2,7 @@
 
 import os
 import json
-from typing import Set, Dict, List, Optional
+from typing import Set, Dict, List, Optional, Tuple
 
 from redditcommand.config import FileStateConfig
 
@@ -13,6 +13,9 @@ class FollowedUserStore:
     FILTER_MAP_PATH = FileStateConfig.FILTER_MAP_PATH
     SUBREDDIT_MAP_PATH = FileStateConfig.SUBREDDIT_MAP_PATH
 
+    # Parsed filter map keyed by the file's (mtime, size); the follow job checks filters per post
+    _filters_cache: Optional[Tuple[Tuple[int, int], Dict[str, List[str]]]] = None
+
     @classmethod
     def load_seen_post_ids(cls) -> Set[str]:
         if not os.path.exists(cls.SEEN_POSTS_PATH):
@@ -61,16 +64,28 @@ class FollowedUserStore:
             cls.save_user_follower_map(data)
 
     @classmethod
-    def load_user_filters(cls) -> Dict[str, List[str]]:
-        if not os.path.exists(cls.FILTER_MAP_PATH):
+    def _cached_user_filters(cls) -> Dict[str, List[str]]:
+        try:
+            st = os.stat(cls.FILTER_MAP_PATH)
+        except FileNotFoundError:
             return {}
-        with open(cls.FILTER_MAP_PATH, "r") as f:
-            return json.load(f)
+        key = (st.st_mtime_ns, st.st_size)
+        if cls._filters_cache is None or cls._filters_cache[0] != key:
+            with open(cls.FILTER_MAP_PATH, "r") as f:
+                cls._filters_cache = (key, json.load(f))
+        return cls._filters_cache[1]
+
+    @classmethod
+    def load_user_filters(cls) -> Dict[str, List[str]]:
+        return {user: list(terms) for user, terms in cls._cached_user_filters().items()}
 
     @classmethod
     def save_user_filters(cls, data: Dict[str, List[str]]):
         with open(cls.FILTER_MAP_PATH, "w") as f:
             json.dump(data, f, indent=2)
+        # Refresh from what was just written; a same-size rewrite can keep a coarse mtime
+        st = os.stat(cls.FILTER_MAP_PATH)
+        cls._filters_cache = ((st.st_mtime_ns, st.st_size), {user: list(terms) for user, terms in data.items()})
 
     @classmethod
     def set_filters(cls, tg_username: str, terms: List[str]):
@@ -80,7 +95,7 @@ class FollowedUserStore:
 
     @classmethod
     def get_filters(cls, tg_username: str) -> List[str]:
-        return cls.load_user_filters().get(tg_username, [])
+        return list(cls._cached_user_filters().get(tg_username, []))
 
     @classmethod
     def clear_filters(cls, tg_username: str):
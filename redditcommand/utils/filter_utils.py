@@ -1,10 +1,11 @@
 # redditcommand/utils/filter_utils.py
 
 import re
+import logging
 from typing import Optional, Set
 from asyncpraw.models import Submission
 
-from redditcommand.utils.url_utils import is_valid_media_url, matches_media_type
+from redditcommand.utils.url_utils import is_gfycat, media_skip_reason
 from redditcommand.config import SkipReasons
 from redditcommand.utils.log_manager import LogManager
 
@@ -12,48 +13,47 @@ logger = LogManager.setup_main_logger()
 skip_logger = LogManager.get_skip_logger()
 accepted_logger = LogManager.get_accepted_logger()
 
+_EMOJI_TAG_RE = re.compile(r":[^:\s]+:")
+
 
 class FilterUtils:
     @staticmethod
     async def attach_metadata(post: Submission) -> None:
         # clean the flair by removing emoji-like tags (:emoji:) and trimming
         raw_flair = post.link_flair_text or ""
-        cleaned_flair = re.sub(r":[^:\s]+:", "", raw_flair).strip()
+        cleaned_flair = _EMOJI_TAG_RE.sub("", raw_flair).strip() if ":" in raw_flair else raw_flair.strip()
         cleaned_flair = cleaned_flair if cleaned_flair.lower() != "none" and cleaned_flair else None
 
+        title = post.title or "Unknown"
+        author = post.author
         post.metadata = {
-            "title": (post.title or "Unknown")[:100],
+            "title": title[:100],
             "url": post.url,
             "id": post.id,
             "link_flair_text": cleaned_flair,
             "file_path": None,
             "upvotes": post.score,
-            "author": post.author.name if post.author else "[deleted]"
+            "author": author.name if author else "[deleted]"
         }
 
-        accepted_logger.info(
-            f"[accepted] r/{getattr(post.subreddit, 'display_name', 'unknown')} | "
-            f"ID: {post.id} | Title: {post.title[:50]} | Flair: {cleaned_flair or 'None'} | "
-            f"Upvotes: {post.score} | Author: {post.metadata['author']} | Media URL: {post.url} | Post Link: https://reddit.com/comments/{post.id}"
-        )
+        if accepted_logger.isEnabledFor(logging.INFO):
+            accepted_logger.info(
+                f"[accepted] r/{getattr(post.subreddit, 'display_name', 'unknown')} | "
+                f"ID: {post.id} | Title: {title[:50]} | Flair: {cleaned_flair or 'None'} | "
+                f"Upvotes: {post.score} | Author: {post.metadata['author']} | Media URL: {post.url} | Post Link: https://reddit.com/comments/{post.id}"
+            )
 
     @staticmethod
     def should_skip(
         post: Submission, processed_urls: Set[str], media_type: Optional[str]
     ) -> Optional[str]:
         url = post.url or ""
-        reason = None
-
-        if not url or not is_valid_media_url(url):
-            reason = SkipReasons.NON_MEDIA
-        elif url in processed_urls:
+        reason = media_skip_reason(url, media_type) if url else SkipReasons.NON_MEDIA
+        # Processed ranks after non-media but before the other URL checks
+        if reason != SkipReasons.NON_MEDIA and url in processed_urls:
             reason = SkipReasons.PROCESSED
-        elif FilterUtils.is_gfycat(url):
-            reason = SkipReasons.GFYCAT
-        elif not matches_media_type(url, media_type):
-            reason = SkipReasons.WRONG_TYPE
 
-        if reason:
+        if reason and skip_logger.isEnabledFor(logging.INFO):
             skip_logger.info(
                 f"[{reason}] r/{getattr(post.subreddit, 'display_name', 'unknown')} | "
                 f"ID: {post.id} | Title: {post.title[:50]} | Flair: {post.link_flair_text} | "
@@ -63,9 +63,11 @@ class FilterUtils:
 
     @staticmethod
     def is_gfycat(url: str) -> bool:
-        return "gfycat.com" in url.lower()
+        return is_gfycat(url)
 
     @staticmethod
     def log_skips(skip_reasons: dict) -> None:
+        if not logger.isEnabledFor(logging.INFO):
+            return
         summary = ", ".join(f"{k}: {v}" for k, v in skip_reasons.items())
         logger.info(f"Skipped posts summary: {summary}")
\ No newline at end of file
@@ -0,0 +1,92 @@
+# redditcommand/utils/inflight.py
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from redditcommand.config import InflightConfig
+
+# Handed to waiters when the call they joined was cancelled; they retry instead of failing
+_LEADER_CANCELLED = object()
+
+
+def coalesce(
+    key: Callable[..., Optional[Hashable]],
+    ttl: float = InflightConfig.TTL_SECONDS,
+    max_entries: int = InflightConfig.MAX_ENTRIES,
+):
+    """
+    Decorator for async functions that collapses concurrent calls with the same key
+    into one underlying call, and serves settled non-empty results for `ttl` seconds.
+
+    `key` receives the call arguments and returns a hashable key, or None to bypass.
+    Failed calls are never cached; waiters see the same exception. If the leading
+    call is cancelled, its waiters run the call again instead.
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        inflight: Dict[Hashable, asyncio.Future] = {}
+        settled: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                k = key(*args, **kwargs)
+            except Exception:
+                k = None
+            if k is None:
+                return await fn(*args, **kwargs)
+
+            while True:
+                hit = settled.get(k)
+                if hit is not None:
+                    if time.monotonic() - hit[0] < ttl:
+                        settled.move_to_end(k)
+                        return hit[1]
+                    del settled[k]
+
+                pending = inflight.get(k)
+                if pending is None:
+                    break
+                result = await asyncio.shield(pending)
+                if result is not _LEADER_CANCELLED:
+                    return result
+                # The leading call was cancelled, not this one: try again, possibly as the new leader
+
+            future = asyncio.get_running_loop().create_future()
+            inflight[k] = future
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                inflight.pop(k, None)
+                if isinstance(e, asyncio.CancelledError):
+                    future.set_result(_LEADER_CANCELLED)
+                else:
+                    future.set_exception(e)
+                    # Mark retrieved so a call without waiters does not warn
+                    future.exception()
+                raise
+
+            inflight.pop(k, None)
+            future.set_result(result)
+            if result:
+                settled[k] = (time.monotonic(), result)
+                while len(settled) > max_entries:
+                    settled.popitem(last=False)
+            return result
+
+        def cache_clear() -> None:
+            settled.clear()
+
+        def cache_pop(*args, **kwargs) -> None:
+            try:
+                settled.pop(key(*args, **kwargs), None)
+            except Exception:
+                pass
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_pop = cache_pop
+        return wrapper
+
+    return decorator
@@ -3,7 +3,7 @@
 import logging
 import os
 import sys
-from redditcommand.config import LogConfig
+from redditcommand.config import LogConfig, SETTINGS
 
 
 class BaseLogger:
@@ -13,7 +13,7 @@ class BaseLogger:
         if isinstance(level, str):
             level = getattr(logging, level.upper(), logging.INFO)
         if level is None:
-            level = getattr(logging, os.getenv("LOG_LEVEL", "DEBUG").upper(), logging.INFO)
+            level = getattr(logging, SETTINGS.log_level.upper(), logging.INFO)
 
         logger = logging.getLogger()
         logger.setLevel(level)
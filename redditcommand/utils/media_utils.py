@@ -1,10 +1,13 @@
 # redditcommand/utils/media_utils.py
 
 import os
+import re
 import asyncio
+import functools
 import aiohttp
+import aiofiles
 
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from asyncpraw import Reddit
 from asyncpraw.models import Submission, Comment
 from telegram import InputFile, Bot, Update
@@ -13,25 +16,55 @@ from PIL import Image
 from urllib.parse import urlparse
 
 from redditcommand.utils.tempfile_utils import TempFileManager
-from redditcommand.config import TimeoutConfig, CommentFilterConfig
+from redditcommand.utils.ffmpeg_runner import FFmpegRunner
+from redditcommand.config import TimeoutConfig, CommentFilterConfig, MediaConfig, InflightConfig, SETTINGS
+from redditcommand.utils.inflight import coalesce
 from redditcommand.utils.session import GlobalSession
 from redditcommand.utils.log_manager import LogManager
 
 logger = LogManager.setup_main_logger()
 
+_VIDEO_EXTS = frozenset({".mp4"})
+_PHOTO_EXTS = frozenset({".jpg", ".jpeg", ".png"})
+# One case-insensitive scan per comment instead of lower() plus a substring test per term
+_COMMENT_BLACKLIST_RE = re.compile(
+    "|".join(re.escape(term) for term in CommentFilterConfig.BLACKLIST_TERMS), re.IGNORECASE
+)
+
+
+def _top_comment_key(post, return_author: bool = False):
+    # Repeat commands often send the same posts again; their comments are reused for a while
+    return ("top_comment", post.id, return_author)
+
 
 class MediaSender:
     @staticmethod
     def determine_type_and_send(file_path: str):
-        ext = os.path.splitext(urlparse(file_path).path)[1].lower()
-        if ext in (".mp4"):
+        # Called with local paths only; URL parsing would cut names containing '?' or '#'
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in _VIDEO_EXTS:
             return MediaSender.send_video
-        if ext in (".jpg", ".jpeg", ".png"):
+        if ext in _PHOTO_EXTS:
             return MediaSender.send_photo
 
         logger.warning(f"Unsupported media type for: {file_path}")
         return None
 
+    @staticmethod
+    def url_upload_limit_mb(url: str) -> Optional[int]:
+        # Size cap for letting Telegram fetch the URL itself; photos only, since videos
+        # need the width/height send_video reads from the downloaded file
+        if not url.startswith(("http://", "https://")):
+            return None
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        return MediaConfig.URL_UPLOAD_PHOTO_MAX_MB if ext in _PHOTO_EXTS else None
+
+    @staticmethod
+    async def send_url(url: str, target, caption: Optional[str] = None):
+        """Send a remote photo by URL; Telegram downloads it server-side."""
+        bot, chat_id = MediaSender.resolve_target(target)
+        await bot.send_photo(chat_id=chat_id, photo=url, caption=caption)
+
     @staticmethod
     def resolve_target(target):
         if isinstance(target, Update):
@@ -39,29 +72,78 @@ class MediaSender:
         elif isinstance(target, tuple) and len(target) == 2:
             return target
         else:
-            bot = Bot(token=os.getenv("TELEGRAM_API_KEY"))
-            chat_id = int(os.getenv("TELEGRAM_CHAT_ID"))
+            bot = Bot(token=SETTINGS.telegram_api_key)
+            chat_id = SETTINGS.telegram_chat_id
             return bot, chat_id
 
+    @staticmethod
+    def _mp4_dimensions(file_path: str) -> Optional[Tuple[int, int]]:
+        # Display size from the first video track header (moov/trak/tkhd), no decoding
+        def walk(f, end):
+            while f.tell() + 8 <= end:
+                start = f.tell()
+                header = f.read(8)
+                size = int.from_bytes(header[:4], "big")
+                kind = header[4:8]
+                if size == 1:
+                    size = int.from_bytes(f.read(8), "big")
+                elif size == 0:
+                    size = end - start
+                if size < 8:
+                    return None
+                if kind in (b"moov", b"trak"):
+                    found = walk(f, start + size)
+                    if found:
+                        return found
+                elif kind == b"tkhd":
+                    # width and height are the last two 16.16 fixed-point fields
+                    f.seek(start + size - 8)
+                    width = int.from_bytes(f.read(4), "big") >> 16
+                    height = int.from_bytes(f.read(4), "big") >> 16
+                    if width and height:
+                        return width, height
+                f.seek(start + size)
+            return None
+
+        with open(file_path, "rb") as f:
+            if f.read(8)[4:8] != b"ftyp":
+                return None
+            end = f.seek(0, os.SEEK_END)
+            f.seek(0)
+            return walk(f, end)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _cached_mp4_dimensions(file_path: str, mtime_ns: int, size: int) -> Optional[Tuple[int, int]]:
+        # Keyed on mtime and size so a rewritten file is parsed again; upload retries hit the cache
+        return MediaSender._mp4_dimensions(file_path)
+
+    @staticmethod
+    def _probe_dimensions(file_path: str) -> Optional[Tuple[int, int]]:
+        # Blocking file reads; run off the event loop
+        st = os.stat(file_path)
+        return MediaSender._cached_mp4_dimensions(file_path, st.st_mtime_ns, st.st_size)
+
     @staticmethod
     async def send_video(file_path: str, target, caption: Optional[str] = None):
         bot, chat_id = MediaSender.resolve_target(target)
 
         try:
-            from cv2 import VideoCapture, CAP_PROP_FRAME_WIDTH, CAP_PROP_FRAME_HEIGHT
-            cap = VideoCapture(file_path)
-            width = int(cap.get(CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(CAP_PROP_FRAME_HEIGHT))
-            cap.release()
+            dims = await asyncio.to_thread(MediaSender._probe_dimensions, file_path)
+            if not dims:
+                # Not a parseable MP4; ffprobe reads the container metadata without decoding frames
+                dims = await FFmpegRunner.probe_dimensions(file_path)
+            width, height = dims or (0, 0)
         except Exception as e:
-            logger.warning(f"OpenCV failed to get dimensions: {e}")
+            logger.warning(f"Failed to get video dimensions: {e}")
             width = height = 0
 
         if not (width and height):
             raise ValueError(f"Invalid video dimensions for: {file_path}")
 
         with open(file_path, "rb") as f:
-            telegram_file = InputFile(f, filename=os.path.basename(file_path))
+            # Stream from the open handle instead of reading the whole file into memory first
+            telegram_file = InputFile(f, filename=os.path.basename(file_path), read_file_handle=False)
             await bot.send_video(
                 chat_id=chat_id,
                 video=telegram_file,
@@ -83,7 +165,7 @@ class MediaSender:
             return
 
         with open(file_path, "rb") as f:
-            telegram_file = InputFile(f, filename=os.path.basename(file_path))
+            telegram_file = InputFile(f, filename=os.path.basename(file_path), read_file_handle=False)
             await bot.send_photo(
                 chat_id=chat_id,
                 photo=telegram_file,
@@ -93,11 +175,71 @@ class MediaSender:
 class MediaUtils:
     @staticmethod
     async def convert_gif_to_mp4(gif_path: str) -> Optional[str]:
+        """
+        Convert a downloaded .gif/.gifv to .mp4. Files that already are MP4 containers
+        (Imgur .gifv) are just renamed, or stream-copied with +faststart when their moov
+        index trails the media data; other non-GIF inputs are remuxed with a stream
+        copy; re-encoding is the fallback.
+        """
         if not await MediaUtils.validate_file(gif_path):
             logger.error(f"File not found for conversion: {gif_path}")
             return None
 
-        mp4_path = gif_path.replace(".gif", ".mp4")
+        mp4_path = os.path.splitext(gif_path)[0] + ".mp4"
+
+        def read_header() -> bytes:
+            with open(gif_path, "rb") as f:
+                return f.read(12)
+
+        header = await asyncio.to_thread(read_header)
+        if header[4:8] == b"ftyp":
+            if await asyncio.to_thread(MediaUtils._mdat_before_moov, gif_path):
+                faststart_command = [
+                    "ffmpeg", "-y", "-i", gif_path,
+                    "-c", "copy",
+                    "-movflags", "+faststart",
+                    mp4_path,
+                ]
+                if await MediaUtils._run_ffmpeg(faststart_command):
+                    logger.info(f"Moved moov atom to front without re-encoding: {mp4_path}")
+                    await TempFileManager.acleanup(gif_path)
+                    return mp4_path
+            await asyncio.to_thread(os.replace, gif_path, mp4_path)
+            logger.info(f"Already an MP4 container, renamed: {mp4_path}")
+            return mp4_path
+
+        if header[:6] not in (b"GIF87a", b"GIF89a"):
+            copy_command = [
+                "ffmpeg", "-y", "-i", gif_path,
+                "-c", "copy",
+                "-movflags", "+faststart",
+                mp4_path,
+            ]
+            if await MediaUtils._run_ffmpeg(copy_command):
+                logger.info(f"Remuxed without re-encoding: {mp4_path}")
+                await TempFileManager.acleanup(gif_path)
+                return mp4_path
+            logger.info(f"Stream copy failed, re-encoding: {gif_path}")
+
+        hw_encoder = MediaConfig.HW_VIDEO_ENCODER
+        if hw_encoder and await FFmpegRunner.has_encoder(hw_encoder):
+            # GIF has no hardware decoder, so only the encode is offloaded
+            hw_command = [
+                "ffmpeg", "-y", "-i", gif_path,
+                "-c:v", hw_encoder,
+                "-preset", "p1",
+                "-movflags", "faststart",
+                "-pix_fmt", "yuv420p",
+                "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+                mp4_path,
+            ]
+            if await MediaUtils._run_ffmpeg(hw_command):
+                logger.info(f"Successfully converted with {hw_encoder}: {mp4_path}")
+                await TempFileManager.acleanup(gif_path)
+                return mp4_path
+            logger.warning(f"{hw_encoder} failed, using libx264 from now on")
+            FFmpegRunner.drop_encoder(hw_encoder)
+
         command = [
             "ffmpeg", "-y", "-i", gif_path,
             "-movflags", "faststart",
@@ -106,43 +248,71 @@ class MediaUtils:
             "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
             mp4_path,
         ]
+        if await MediaUtils._run_ffmpeg(command):
+            logger.info(f"Successfully converted: {mp4_path}")
+            await TempFileManager.acleanup(gif_path)
+            return mp4_path
+        return None
 
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            _, stderr = await process.communicate()
+    @staticmethod
+    def _mdat_before_moov(path: str) -> bool:
+        """
+        Walk the top-level MP4 boxes and report whether the media data precedes the
+        moov index, i.e. whether the file needs a faststart remux to stream.
+        """
+        with open(path, "rb") as f:
+            while True:
+                box = f.read(8)
+                if len(box) < 8:
+                    return False
+                size = int.from_bytes(box[:4], "big")
+                kind = box[4:8]
+                if kind == b"moov":
+                    return False
+                if kind == b"mdat":
+                    return True
+                if size == 1:
+                    size = int.from_bytes(f.read(8), "big") - 8
+                elif size < 8:
+                    return False
+                f.seek(size - 8, os.SEEK_CUR)
 
-            if process.returncode == 0:
-                logger.info(f"Successfully converted: {mp4_path}")
-                TempFileManager.cleanup_file(gif_path)
-                return mp4_path
-            logger.error(f"FFmpeg error: {stderr.decode()}")
+    @staticmethod
+    async def _run_ffmpeg(command: list[str]) -> bool:
+        try:
+            returncode, stderr = await FFmpegRunner.run(command)
+            if returncode == 0:
+                return True
+            logger.error(f"FFmpeg error: {stderr.decode(errors='ignore')}")
         except Exception as e:
             logger.error(f"GIF to MP4 conversion error: {e}", exc_info=True)
-        return None
+        return False
 
     @staticmethod
     async def validate_file(file_path: str) -> bool:
-        def check():
-            return os.path.exists(file_path) and os.path.getsize(file_path) > 0
-
-        is_valid = await asyncio.to_thread(check)
+        is_valid = bool(await asyncio.to_thread(TempFileManager.file_size, file_path))
         logger.info(f"Validated file: {file_path}" if is_valid else f"Invalid file: {file_path}")
         return is_valid
 
     @staticmethod
-    async def resolve_reddit_gallery(post_id: str, reddit: Reddit) -> Optional[str]:
+    async def resolve_reddit_gallery(post_id: str, reddit: Reddit, post: Optional[Submission] = None) -> Optional[str]:
+        """
+        Return the first image URL of a gallery. Listing results already carry
+        gallery_data/media_metadata for gallery posts, so the extra submission fetch
+        is only made when `post` is not the gallery itself or lacks that data.
+        """
         try:
-            submission = await reddit.submission(id=post_id)
-            await submission.load()
+            fields = vars(post) if post is not None and getattr(post, "id", None) == post_id else {}
+            gallery_data = fields.get("gallery_data")
+            media_metadata = fields.get("media_metadata")
 
-            gallery_order = submission.gallery_data["items"]
-            media_metadata = submission.media_metadata
+            if not (gallery_data and media_metadata):
+                submission = await reddit.submission(id=post_id)
+                await submission.load()
+                gallery_data = submission.gallery_data
+                media_metadata = submission.media_metadata
 
-            for item in gallery_order:
+            for item in gallery_data["items"]:
                 media_id = item["media_id"]
                 media_info = media_metadata.get(media_id)
                 if media_info and "s" in media_info and "u" in media_info["s"]:
@@ -155,50 +325,145 @@ class MediaUtils:
             return None
 
     @staticmethod
+    @coalesce(key=_top_comment_key, ttl=InflightConfig.TOP_COMMENT_TTL_SECONDS)
     async def fetch_top_comment(post: Submission, return_author: bool = False) -> Optional[Union[str, Comment]]:
         try:
+            # Only the first few top comments are needed; MoreComments stubs are never expanded
+            post.comment_sort = CommentFilterConfig.COMMENT_SORT
+            post.comment_limit = CommentFilterConfig.COMMENT_LIMIT
             await post.comments()
             for c in post.comments.list():
-                if c.body and not any(term in c.body.lower() for term in CommentFilterConfig.BLACKLIST_TERMS):
-                    return c if return_author else c.body
+                body = getattr(c, "body", None)  # MoreComments placeholders have no body
+                if not body or len(body) > CommentFilterConfig.MAX_COMMENT_LENGTH:
+                    continue
+                if not _COMMENT_BLACKLIST_RE.search(body):
+                    return c if return_author else body
         except Exception as e:
             logger.warning(f"Top comment fetch failed: {e}")
         return None
 
 class MediaDownloader:
     @staticmethod
-    async def find_first_valid_url(urls: list[str], session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
+    async def find_first_valid_url(
+        urls: list[str],
+        session: Optional[aiohttp.ClientSession] = None,
+        headers: Optional[dict] = None,
+    ) -> Optional[str]:
+        """
+        Probe all candidates concurrently with HEAD (falling back to GET when HEAD is refused)
+        and return the first URL, in the given preference order, that answered 200.
+        Returns as soon as every better candidate has failed; slower probes are cancelled.
+        """
         session = session or await GlobalSession.get()
-        for url in urls:
+
+        async def probe(url: str) -> bool:
             try:
-                async with session.get(url, timeout=10) as response:
+                async with session.head(url, headers=headers, timeout=10, allow_redirects=True) as response:
                     if response.status == 200:
-                        logger.info(f"Valid URL found: {url}")
-                        return url
-            except aiohttp.ClientError:
+                        return True
+                    if response.status not in (403, 405):
+                        return False
+                # HEAD refused: ask for a single byte so the probe does not pull the whole file
+                async with session.get(url, headers={**(headers or {}), "Range": "bytes=0-0"}, timeout=10) as response:
+                    return response.status in (200, 206)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
                 logger.debug(f"Failed to access: {url}")
-        return None
+                return False
+
+        tasks = [asyncio.create_task(probe(url)) for url in urls]
+        try:
+            for url, task in zip(urls, tasks):
+                if await task:
+                    logger.info(f"Valid URL found: {url}")
+                    return url
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
 
     @staticmethod
-    async def download_file(url: str, file_path: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
-        session = session or await GlobalSession.get()
+    async def content_length(
+        url: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        headers: Optional[dict] = None,
+    ) -> Optional[int]:
+        """Size reported by a HEAD request, or None when the server does not say."""
         try:
-            timeout = aiohttp.ClientTimeout(total=TimeoutConfig.DOWNLOAD_TIMEOUT)
-            async with session.get(url, timeout=timeout) as response:
-                if response.status == 200:
-                    with open(file_path, 'wb') as f:
-                        while chunk := await response.content.read(1024 * 1024):
-                            f.write(chunk)
+            session = session or await GlobalSession.get()
+            async with session.head(url, headers=headers, timeout=10, allow_redirects=True) as resp:
+                if resp.status != 200:
+                    return None
+                return resp.content_length
+        except Exception as e:
+            logger.debug(f"HEAD failed for {url}: {e}")
+            return None
+
+    @staticmethod
+    async def download_file(
+        url: str,
+        file_path: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        headers: Optional[dict] = None,
+    ) -> Optional[str]:
+        """
+        Stream the response body to file_path in small chunks. Aborts (and removes the
+        partial file) when the body is larger than MediaConfig.MAX_DOWNLOAD_SIZE_MB.
+        A transfer that breaks off midway is resumed with a Range request when the
+        server supports it, instead of starting over.
+        """
+        session = session or await GlobalSession.get()
+        max_bytes = MediaConfig.MAX_DOWNLOAD_SIZE_MB * 1024 * 1024
+        timeout = aiohttp.ClientTimeout(total=TimeoutConfig.DOWNLOAD_TIMEOUT)
+        written = 0
+
+        for attempt in range(MediaConfig.DOWNLOAD_RESUME_ATTEMPTS + 1):
+            request_headers = dict(headers or {})
+            if written:
+                request_headers["Range"] = f"bytes={written}-"
+            try:
+                async with session.get(url, headers=request_headers or None, timeout=timeout) as response:
+                    if written and response.status == 206:
+                        mode = "ab"
+                    elif response.status == 200:
+                        written, mode = 0, "wb"
+                    else:
+                        logger.error(f"Download failed. Status: {response.status} for URL: {url}")
+                        break
+
+                    declared = response.headers.get("Content-Length")
+                    if declared and declared.isdigit() and written + int(declared) > max_bytes:
+                        logger.warning(f"Skipping download: {(written + int(declared)) / (1024 * 1024):.1f} MB exceeds cap for URL: {url}")
+                        break
+
+                    too_large = False
+                    async with aiofiles.open(file_path, mode) as f:
+                        async for chunk in response.content.iter_chunked(MediaConfig.DOWNLOAD_CHUNK_SIZE):
+                            if written + len(chunk) > max_bytes:
+                                too_large = True
+                                break
+                            await f.write(chunk)
+                            written += len(chunk)
+
+                    if too_large:
+                        logger.warning(f"Aborted download over {MediaConfig.MAX_DOWNLOAD_SIZE_MB} MB for URL: {url}")
+                        break
+
                     logger.info(f"Downloaded to {file_path}")
                     return file_path
-                else:
-                    logger.error(f"Download failed. Status: {response.status} for URL: {url}")
-        except asyncio.TimeoutError:
-            logger.error(f"Download timed out for URL: {url}")
-        except Exception as e:
-            logger.error(f"Error downloading from {url}: {e}", exc_info=True)
+
+            except (asyncio.TimeoutError, aiohttp.ClientPayloadError, aiohttp.ServerDisconnectedError) as e:
+                if written and attempt < MediaConfig.DOWNLOAD_RESUME_ATTEMPTS:
+                    logger.warning(f"Download interrupted after {written} bytes ({type(e).__name__}), resuming: {url}")
+                    continue
+                logger.error(f"Download timed out or was interrupted for URL: {url}")
+                break
+            except Exception as e:
+                logger.error(f"Error downloading from {url}: {e}", exc_info=True)
+                break
+
+        await TempFileManager.acleanup(file_path)
         return None
-    
+
 class CaptionBuilder:
     @staticmethod
     async def build(
@@ -249,11 +514,8 @@ class AVMuxer:
             out_path
         ]
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *copy_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            _, err = await proc.communicate()
-            if proc.returncode == 0 and os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+            returncode, err = await FFmpegRunner.run(copy_cmd)
+            if returncode == 0 and await asyncio.to_thread(TempFileManager.file_size, out_path):
                 return out_path
             logger.warning(f"A/V copy mux failed, retrying with re-encode. ffmpeg: {err.decode(errors='ignore')[:300]}")
         except Exception as e:
@@ -271,17 +533,14 @@ class AVMuxer:
             out_path
         ]
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *reenc_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            _, err = await proc.communicate()
-            if proc.returncode == 0 and os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+            returncode, err = await FFmpegRunner.run(reenc_cmd)
+            if returncode == 0 and await asyncio.to_thread(TempFileManager.file_size, out_path):
                 return out_path
             logger.error(f"A/V re-encode mux failed. ffmpeg: {err.decode(errors='ignore')[:300]}")
         except Exception as e:
             logger.error(f"A/V re-encode mux exception: {e}", exc_info=True)
 
         # Ensure we don’t leave a broken file behind
-        TempFileManager.cleanup_file(out_path)
+        await TempFileManager.acleanup(out_path)
         return None
 
@@ -8,6 +8,8 @@ from asyncpraw import Reddit
 from asyncpraw.models import Submission
 
 from redditcommand.config import Messages
+from redditcommand.utils.fetch_utils import SubredditFetcher
+from redditcommand.utils.rate_limiter import RedditRateLimiter
 from redditcommand.utils.log_manager import LogManager
 
 logger = LogManager.setup_main_logger()
@@ -47,18 +49,23 @@ class PipelineHelper:
     @staticmethod
     async def validate_subreddits(update: Update, reddit_instance: Reddit, subreddit_names: List[str]) -> List[str]:
         valid, invalid = [], []
+        # Same quota-aware gate and shared pacer as the post fetches
+        limiter = RedditRateLimiter(reddit_instance)
 
-        for name in subreddit_names:
-            if name.lower() == "random":
-                valid.append(name)
-                continue
-            try:
-                subreddit = await reddit_instance.subreddit(name)
-                await subreddit.load()
-                valid.append(name)
-            except Exception as e:
-                logger.warning(f"Subreddit {name} is invalid or inaccessible: {e}")
+        async def check(name: str):
+            # Loads are cached per name (SubredditFetcher.load), so repeats cost no round trip
+            if name.lower() != "random":
+                async with limiter:
+                    await SubredditFetcher.load(name, reddit=reddit_instance)
+
+        # All subreddits are checked concurrently; results keep the caller's order
+        results = await asyncio.gather(*(check(name) for name in subreddit_names), return_exceptions=True)
+        for name, result in zip(subreddit_names, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Subreddit {name} is invalid or inaccessible: {result!r}")
                 invalid.append(name)
+            else:
+                valid.append(name)
 
         if invalid and not valid:
             await PipelineHelper.notify_user(update, Messages.NO_VALID_SUBREDDITS)
@@ -71,9 +78,9 @@ class PipelineHelper:
     @staticmethod
     def log_post_summary(posts: List[Submission]) -> None:
         if posts:
-            logger.info("Pipeline Summary:")
-            for post in posts:
-                logger.info(f"Title: {post.title}, URL: {post.url}")
+            # One record, so the file handler writes and flushes once per run
+            lines = "\n".join(f"Title: {post.title}, URL: {post.url}" for post in posts)
+            logger.info(f"Pipeline Summary:\n{lines}")
         else:
             logger.info("No posts were processed.")
 
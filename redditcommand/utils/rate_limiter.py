@@ -0,0 +1,121 @@
+# redditcommand/utils/rate_limiter.py
+
+import time
+import asyncio
+from typing import Optional
+
+from redditcommand.config import MediaConfig, RateLimitConfig
+from redditcommand.utils.log_manager import LogManager
+
+logger = LogManager.setup_main_logger()
+
+
+class RateLimitExhausted(RuntimeError):
+    """Raised by a non-waiting limiter when Reddit reports no requests left in the window."""
+
+
+class RequestPacer:
+    """
+    Spaces request starts to a steady rate with a burst allowance (GCRA, the
+    virtual-scheduling form of a token bucket). A slot is reserved synchronously
+    on each call, so concurrent callers are paced in arrival order without a lock.
+    """
+
+    def __init__(
+        self,
+        per_minute: float = RateLimitConfig.REQUESTS_PER_MINUTE,
+        burst: int = RateLimitConfig.BURST,
+    ):
+        self.interval = 60.0 / per_minute
+        self.tolerance = (max(1, burst) - 1) * self.interval
+        self._next_slot = 0.0
+
+    def reserve(self) -> float:
+        """Take the next slot; returns how long the caller must wait before using it."""
+        now = time.monotonic()
+        slot = max(self._next_slot, now)
+        self._next_slot = slot + self.interval
+        return max(0.0, slot - self.tolerance - now)
+
+    async def wait(self) -> None:
+        delay = self.reserve()
+        if delay:
+            logger.debug(f"Pacing Reddit request by {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def reset(self) -> None:
+        self._next_slot = 0.0
+
+
+# One pacer for the process: every limiter talks to Reddit through the same client and quota
+REDDIT_PACER = RequestPacer()
+
+
+class RedditRateLimiter:
+    """
+    Concurrency gate for Reddit API calls that adapts to the quota Reddit reports
+    (X-Ratelimit-Remaining, surfaced by asyncpraw as reddit.auth.limits).
+
+    Runs up to max_concurrency calls while quota is plentiful, drops to one call at
+    a time below the low watermark, and either waits or raises RateLimitExhausted
+    when the window is used up. asyncprawcore still sleeps until the window resets.
+    Request starts are additionally paced by a RequestPacer (shared by default) so
+    bursts do not run into that sleep in the first place.
+    """
+
+    def __init__(
+        self,
+        reddit=None,
+        max_concurrency: int = MediaConfig.DEFAULT_SEMAPHORE_LIMIT,
+        low_watermark: int = RateLimitConfig.LOW_WATERMARK,
+        wait: bool = True,
+        pacer: Optional[RequestPacer] = None,
+    ):
+        self.reddit = reddit
+        self.pacer = pacer or REDDIT_PACER
+        self.max_concurrency = max(1, max_concurrency)
+        self.low_watermark = low_watermark
+        self.wait = wait
+        self.remaining: Optional[int] = None
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    def bind(self, reddit) -> None:
+        self.reddit = reddit
+
+    def refresh(self) -> None:
+        if self.reddit is None:
+            return
+        try:
+            remaining = self.reddit.auth.limits.get("remaining")
+        except Exception:
+            return
+        if remaining is not None:
+            self.remaining = int(remaining)
+
+    def allowed_concurrency(self) -> int:
+        if self.remaining is None:
+            return self.max_concurrency
+        if self.remaining < self.low_watermark:
+            return 1
+        return min(self.max_concurrency, self.remaining)
+
+    async def __aenter__(self):
+        self.refresh()
+        if not self.wait and self.remaining is not None and self.remaining <= 0:
+            raise RateLimitExhausted("Reddit rate limit window exhausted")
+
+        # Paced before taking a slot so a waiting request does not hold one
+        await self.pacer.wait()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self.allowed_concurrency())
+            self._active += 1
+        if self.remaining is not None and self.remaining < self.low_watermark:
+            logger.debug(f"Reddit quota low ({self.remaining} left); serializing requests")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.refresh()
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
@@ -180,18 +180,11 @@ class RedditVideoResolver:
 
     @classmethod
     async def find_dash_url(cls, base_url: str, session: Optional[aiohttp.ClientSession] = None) -> str:
+        from redditcommand.utils.media_utils import MediaDownloader
+
         session = session or await cls._get_session()
-        for res in RedditVideoConfig.DASH_RESOLUTIONS:
-            url = f"{base_url}/DASH_{res}.mp4"
-            try:
-                async with session.head(url, headers=cls._default_headers(), timeout=5) as resp:
-                    if resp.status == 200:
-                        return url
-            except aiohttp.ClientError as e:
-                logger.debug(f"[Resolver] DASH_{res} not accessible: {e}")
-            except Exception as e:
-                logger.error(f"[Resolver] Unexpected error while checking DASH_{res}: {e}", exc_info=True)
-        return ""
+        urls = [f"{base_url}/DASH_{res}.mp4" for res in RedditVideoConfig.DASH_RESOLUTIONS]
+        return await MediaDownloader.find_first_valid_url(urls, session=session, headers=cls._default_headers()) or ""
 
     # ---------- Public entry points ----------
 
@@ -259,7 +252,7 @@ class RedditVideoResolver:
                 return cls._default_headers()
 
             async def _probe(url: str) -> bool:
-                # Some CDNs 403 on HEAD; try HEAD then GET.
+                # Some CDNs 403 on HEAD; try HEAD then a one-byte ranged GET.
                 try:
                     async with session.head(url, headers=_headers(), timeout=5) as r:
                         if r.status == 200:
@@ -267,27 +260,14 @@ class RedditVideoResolver:
                 except Exception:
                     pass
                 try:
-                    async with session.get(url, headers=_headers(), timeout=5) as r:
-                        return r.status == 200
+                    async with session.get(url, headers={**_headers(), "Range": "bytes=0-0"}, timeout=5) as r:
+                        return r.status in (200, 206)
                 except Exception:
                     return False
 
             async def _download(url: str, dst: str) -> Optional[str]:
-                try:
-                    async with session.get(url, headers=_headers()) as r:
-                        if r.status != 200:
-                            logger.info(f"[Resolver] Download got {r.status} for {url}")
-                            return None
-                        with open(dst, "wb") as f:
-                            while True:
-                                chunk = await r.content.read(1024 * 1024)
-                                if not chunk:
-                                    break
-                                f.write(chunk)
-                    return dst
-                except Exception as e:
-                    logger.debug(f"[Resolver] Download error for {url}: {e}")
-                    return None
+                from redditcommand.utils.media_utils import MediaDownloader
+                return await MediaDownloader.download_file(url, dst, session=session, headers=_headers())
 
             # ---------- download video ----------
             v_path = await _download(dash_video_url, video_tmp)
@@ -319,8 +299,8 @@ class RedditVideoResolver:
                     if muxed:
                         # clean up temps
                         try:
-                            TempFileManager.cleanup_file(video_tmp)
-                            TempFileManager.cleanup_file(audio_tmp)
+                            await TempFileManager.acleanup(video_tmp)
+                            await TempFileManager.acleanup(audio_tmp)
                         except Exception:
                             pass
                         logger.info(f"[Resolver] Successfully muxed to {canonical_out}")
@@ -341,7 +321,7 @@ class RedditVideoResolver:
                 return v_path  # last resort
 
             try:
-                TempFileManager.cleanup_file(audio_tmp)
+                await TempFileManager.acleanup(audio_tmp)
             except Exception:
                 pass
 
@@ -2,16 +2,63 @@
 
 import aiohttp
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import aiodns  # enables aiohttp.AsyncResolver
+except ImportError:  # optional speedup
+    aiodns = None
+
+from redditcommand.config import HttpConfig
+
+
+if orjson is not None:
+    class OrjsonClientResponse(aiohttp.ClientResponse):
+        async def json(self, *, encoding=None, loads=orjson.loads, content_type="application/json"):
+            return await super().json(encoding=encoding, loads=loads, content_type=content_type)
+else:
+    OrjsonClientResponse = None
+
+
+def build_reddit_session():
+    """
+    Session handed to asyncpraw so Reddit listings are decoded with orjson.
+    Returns None (asyncpraw creates its own session) when orjson is not installed.
+    """
+    if OrjsonClientResponse is None:
+        return None
+    return aiohttp.ClientSession(
+        response_class=OrjsonClientResponse,
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        connector=GlobalSession._build_connector(),
+    )
+
+
 class GlobalSession:
     _session = None
 
+    @staticmethod
+    def _build_connector() -> aiohttp.TCPConnector:
+        # c-ares lookups do not occupy the default executor like getaddrinfo does
+        resolver = aiohttp.AsyncResolver() if aiodns is not None else None
+        return aiohttp.TCPConnector(
+            resolver=resolver,
+            limit=HttpConfig.CONNECTOR_LIMIT,
+            limit_per_host=HttpConfig.CONNECTOR_LIMIT_PER_HOST,
+            ttl_dns_cache=HttpConfig.DNS_CACHE_TTL,
+            keepalive_timeout=HttpConfig.KEEPALIVE_TIMEOUT,
+        )
+
     @classmethod
     async def get(cls):
         if cls._session is None or cls._session.closed:
-            cls._session = aiohttp.ClientSession()
+            cls._session = aiohttp.ClientSession(connector=cls._build_connector())
         return cls._session
 
     @classmethod
     async def close(cls):
         if cls._session and not cls._session.closed:
-            await cls._session.close()
\ No newline at end of file
+            await cls._session.close()
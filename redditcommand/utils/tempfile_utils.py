@@ -1,5 +1,6 @@
 # redditcommand/utils/tempfile_utils.py
 
+import asyncio
 import tempfile
 import os
 import shutil
@@ -23,24 +24,50 @@ class TempFileManager:
             logger.error(f"Error creating temporary directory with prefix '{prefix}': {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def file_size(path: str) -> Optional[int]:
+        """
+        Size in bytes, or None when the path does not exist. One stat call
+        instead of exists() followed by getsize().
+        """
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
+
     @staticmethod
     def cleanup_file(path: str) -> None:
         """
-        Deletes a file or directory and its parent if empty.
+        Deletes a file or a directory tree. Files, the common case, cost a single
+        unlink; missing paths are ignored.
         """
         if not path:
             return
         try:
-            if os.path.isfile(path):
-                os.remove(path)
-                logger.debug(f"Deleted file: {path}")
-            elif os.path.isdir(path):
-                # Recursively delete the temp directory
+            os.remove(path)
+            logger.debug(f"Deleted file: {path}")
+        except FileNotFoundError:
+            pass
+        except (IsADirectoryError, PermissionError) as e:
+            # os.remove refuses directories (PermissionError on macOS)
+            if not os.path.isdir(path):
+                logger.error(f"Cleanup failed for {path}: {e}")
+                return
+            try:
                 shutil.rmtree(path)
                 logger.debug(f"Deleted directory: {path}")
+            except Exception as e:
+                logger.error(f"Cleanup failed for {path}: {e}", exc_info=True)
         except Exception as e:
             logger.error(f"Cleanup failed for {path}: {e}", exc_info=True)
 
+    @staticmethod
+    async def acleanup(path: str) -> None:
+        """
+        cleanup_file run in a worker thread, for callers on the event loop.
+        """
+        await asyncio.to_thread(TempFileManager.cleanup_file, path)
+
     @staticmethod
     def extract_post_id_from_url(url: str) -> Optional[str]:
         match = re.search(r"comments/([a-z0-9]+)", url) or re.search(r"reddit_(\w+)", url)
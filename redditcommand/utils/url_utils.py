@@ -1,19 +1,55 @@
 # redditcommand/utils/url_utils.py
 
-from redditcommand.config import MediaValidationConfig
+import re
+import functools
+from typing import Optional
 
+from redditcommand.config import MediaValidationConfig, SkipReasons
+
+
+def _compile_classifier(extensions, sources) -> re.Pattern:
+    # One case-insensitive scan: "ends with one of the extensions" OR "contains one of the sources"
+    parts = []
+    if extensions:
+        parts.append("(?:" + "|".join(re.escape(ext) for ext in extensions) + r")\Z")
+    parts.extend(re.escape(src) for src in sources)
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
+_VALID_MEDIA_RE = _compile_classifier(MediaValidationConfig.VALID_EXTENSIONS, MediaValidationConfig.VALID_SOURCES)
+
+_GFYCAT_RE = re.compile(r"gfycat\.com", re.IGNORECASE)
+
+_MEDIA_TYPE_RES = {
+    "image": _compile_classifier(MediaValidationConfig.IMAGE_EXTENSIONS, MediaValidationConfig.SOURCE_HINTS["image"]),
+    "video": _compile_classifier(MediaValidationConfig.VIDEO_EXTENSIONS, MediaValidationConfig.SOURCE_HINTS["video"]),
+}
+
+
+@functools.lru_cache(maxsize=MediaValidationConfig.URL_CACHE_SIZE)
 def is_valid_media_url(url: str) -> bool:
-    url = url.lower()
-    return (
-        url.endswith(MediaValidationConfig.VALID_EXTENSIONS) or
-        any(source in url for source in MediaValidationConfig.VALID_SOURCES)
-    )
-
-def matches_media_type(url: str, media_type: str) -> bool:
-    url = url.lower()
-    return (
-        not media_type
-        or (media_type == "image" and url.endswith(MediaValidationConfig.IMAGE_EXTENSIONS))
-        or (media_type == "video" and url.endswith(MediaValidationConfig.VIDEO_EXTENSIONS))
-        or any(source in url for source in MediaValidationConfig.SOURCE_HINTS.get(media_type, []))
-    )
\ No newline at end of file
+    return _VALID_MEDIA_RE.search(url) is not None
+
+@functools.lru_cache(maxsize=MediaValidationConfig.URL_CACHE_SIZE)
+def matches_media_type(url: str, media_type: Optional[str]) -> bool:
+    if not media_type:
+        return True
+    pattern = _MEDIA_TYPE_RES.get(media_type)
+    return pattern is not None and pattern.search(url) is not None
+
+def is_gfycat(url: str) -> bool:
+    return _GFYCAT_RE.search(url) is not None
+
+@functools.lru_cache(maxsize=MediaValidationConfig.URL_CACHE_SIZE)
+def media_skip_reason(url: str, media_type: Optional[str]) -> Optional[str]:
+    """
+    The URL-only skip checks of FilterUtils.should_skip (non-media, gfycat, wrong type),
+    as one cached lookup per URL and media type.
+    """
+    if not is_valid_media_url(url):
+        return SkipReasons.NON_MEDIA
+    if is_gfycat(url):
+        return SkipReasons.GFYCAT
+    if not matches_media_type(url, media_type):
+        return SkipReasons.WRONG_TYPE
+    return None
@@ -0,0 +1,125 @@
+# redditcommand/utils/ytdlp_runner.py
+
+import asyncio
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import List, Optional, Set, Tuple
+
+from redditcommand.config import RedditVideoConfig
+from redditcommand.utils.log_manager import LogManager
+
+logger = LogManager.setup_main_logger()
+
+
+class _ErrorCollector:
+    # yt-dlp logger that keeps error lines instead of writing them to the worker's stderr
+    def __init__(self):
+        self.errors: List[str] = []
+
+    def debug(self, msg: str) -> None:
+        pass
+
+    def info(self, msg: str) -> None:
+        pass
+
+    def warning(self, msg: str) -> None:
+        pass
+
+    def error(self, msg: str) -> None:
+        self.errors.append(msg)
+
+
+def _run_ytdlp(args: List[str]) -> Tuple[int, str]:
+    # Runs inside a per-job child; under forkserver yt_dlp is already imported
+    import yt_dlp
+
+    collector = _ErrorCollector()
+    try:
+        parsed = yt_dlp.parse_options(args)
+        with yt_dlp.YoutubeDL({**parsed.ydl_opts, "logger": collector}) as ydl:
+            returncode = ydl.download(parsed.urls)
+    except BaseException as e:  # DownloadError, or SystemExit from option parsing
+        return 1, "\n".join(collector.errors) or str(e)
+    return returncode, "\n".join(collector.errors)
+
+
+def _ytdlp_child(args: List[str], conn) -> None:
+    # Entry point of a per-job process; the result goes back over the pipe
+    try:
+        conn.send(_run_ytdlp(args))
+    finally:
+        conn.close()
+
+
+class YtDlpRunner:
+    """
+    Runs each yt-dlp download in its own child process instead of spawning the
+    yt-dlp executable. Children are forked from a forkserver that has yt_dlp
+    preloaded, so the import is paid once; a job that times out or is cancelled is
+    terminated on its own without touching other downloads. Takes the same
+    arguments as the command line.
+    """
+    _context = None
+    _slots: Optional[asyncio.Semaphore] = None
+    _running: Set[BaseProcess] = set()
+
+    @classmethod
+    def _get_context(cls):
+        if cls._context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                cls._context = multiprocessing.get_context("forkserver")
+                cls._context.set_forkserver_preload(["yt_dlp"])
+            else:
+                cls._context = multiprocessing.get_context("spawn")
+        return cls._context
+
+    @classmethod
+    def _get_slots(cls) -> asyncio.Semaphore:
+        if cls._slots is None:
+            cls._slots = asyncio.Semaphore(RedditVideoConfig.YTDLP_WORKERS)
+        return cls._slots
+
+    @staticmethod
+    def _start(context, args: List[str]) -> Tuple[BaseProcess, Connection]:
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(target=_ytdlp_child, args=(args, writer), daemon=True)
+        process.start()
+        writer.close()
+        return process, reader
+
+    @staticmethod
+    def _receive(process: BaseProcess, reader: Connection) -> Tuple[int, str]:
+        # Blocks until the child answers or dies (a terminated child closes the pipe)
+        try:
+            return reader.recv()
+        except EOFError:
+            process.join()
+            return 1, f"yt-dlp worker exited with code {process.exitcode}"
+        finally:
+            reader.close()
+            process.join()
+
+    @classmethod
+    async def run(cls, args: List[str], timeout: float) -> Tuple[int, str]:
+        """
+        Returns (exit code, error message). On timeout or cancellation only this
+        job's process is terminated, and the exception propagates.
+        """
+        async with cls._get_slots():
+            process, reader = await asyncio.to_thread(cls._start, cls._get_context(), args)
+            cls._running.add(process)
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(cls._receive, process, reader), timeout=timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                logger.warning(f"Terminating yt-dlp job (pid {process.pid})")
+                process.terminate()
+                raise
+            finally:
+                cls._running.discard(process)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        for process in list(cls._running):
+            process.terminate()
+        cls._running.clear()
@@ -1,4 +1,5 @@
 # tests/conftest.py
+import asyncio
 import sys
 from pathlib import Path
 import dotenv
@@ -13,6 +14,40 @@ def reset_global_session_singleton(monkeypatch):
     except Exception:
         pass
 
+@pytest.fixture(autouse=True)
+def reset_reddit_pacer():
+    # Pacing state is process-wide; start every test with a full burst allowance
+    from redditcommand.utils.rate_limiter import REDDIT_PACER
+    REDDIT_PACER.reset()
+
+class FakeProc:
+    def __init__(self, stdout=b"", returncode=0):
+        self.stdout = stdout
+        self.returncode = returncode
+    async def communicate(self): return self.stdout, b""
+
+class FakeSubprocess:
+    """
+    Records every create_subprocess_exec argv in commands and answers with
+    respond(args), which returns a FakeProc (exit 0, no output) unless replaced.
+    """
+    proc = FakeProc
+
+    def __init__(self):
+        self.commands = []
+        self.respond = lambda args: FakeProc()
+
+    async def create_subprocess_exec(self, *args, **kwargs):
+        self.commands.append(args)
+        return self.respond(args)
+
+@pytest.fixture
+def fake_subprocess(monkeypatch):
+    # No test may start a real ffmpeg/ffprobe
+    fake = FakeSubprocess()
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake.create_subprocess_exec)
+    return fake
+
 def pytest_configure():
     dotenv.load_dotenv = lambda *a, **k: None
 
@@ -398,3 +398,15 @@ async def test_set_subreddit_happy(monkeypatch):
     from redditcommand.config import Messages
     assert stored["sub"] == "cats"
     assert u.message.replies == [Messages.DEFAULT_SUBREDDIT_SET.format(subreddit="cats")]
+
+# ----- CommandParser -----
+async def test_parser_time_filter_and_flags():
+    from redditcommand.utils.command_utils import CommandParser
+
+    assert CommandParser.extract_time_filter(["Week", "cats"]) == ("week", ["cats"])
+    assert CommandParser.extract_time_filter(["cats", "3"]) == (None, ["cats", "3"])
+
+    count, media_type, terms, comments, flair, title = CommandParser.parse_other_args(["3", "VIDEO", "-f", "Orange", "-t"])
+    assert (count, media_type, terms) == (3, "video", ["orange"])
+    assert (comments, flair, title) == (False, True, True)
+    assert CommandParser.parse_other_args(["-A"])[3:] == (True, True, True)
@@ -0,0 +1,43 @@
+# tests/test_compressor.py
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+# 1) compress: a known duration gives one two-pass encode at the bitrate the target allows
+async def test_compress_two_pass_hits_target(fake_subprocess, tmp_path):
+    from redditcommand.utils.compressor import Compressor
+
+    out = tmp_path / "out.mp4"
+    def respond(args):
+        if args[0] == "ffprobe":
+            return fake_subprocess.proc(stdout=b"100.0\n")
+        if args[args.index("-pass") + 1] == "2":
+            out.write_bytes(b"\x00" * 1024)
+        return fake_subprocess.proc()
+    fake_subprocess.respond = respond
+    commands = fake_subprocess.commands
+
+    result = await Compressor.compress(str(tmp_path / "in.mp4"), str(out), target_size_mb=10)
+    assert result == str(out)
+    assert [c[0] for c in commands] == ["ffprobe", "ffmpeg", "ffmpeg"]
+    # 10 MB * 8192 * 0.95 / 100 s = 778 kbps total, minus 96 kbps audio
+    assert commands[1][commands[1].index("-b:v") + 1] == "682k"
+    assert "-crf" not in commands[2]
+
+
+# 2) compress: without a duration the CRF path runs as before
+async def test_compress_falls_back_to_crf_without_duration(fake_subprocess, tmp_path):
+    from redditcommand.utils.compressor import Compressor
+
+    out = tmp_path / "out.mp4"
+    def respond(args):
+        if args[0] == "ffprobe":
+            return fake_subprocess.proc(returncode=1)
+        out.write_bytes(b"\x00" * 1024)
+        return fake_subprocess.proc()
+    fake_subprocess.respond = respond
+    commands = fake_subprocess.commands
+
+    assert await Compressor.compress(str(tmp_path / "in.mp4"), str(out), target_size_mb=10) == str(out)
+    assert len(commands) == 2 and "-crf" in commands[1]
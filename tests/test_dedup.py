@@ -0,0 +1,39 @@
+# tests/test_dedup.py
+
+
+def test_url_dedup_membership_and_len():
+    from redditcommand.utils.dedup import UrlDedup
+
+    d = UrlDedup()
+    d.update(f"https://u/{i}" for i in range(10))
+    d.add("https://u/3")  # duplicate does not grow the count
+    d.add("")
+
+    assert len(d) == 10
+    assert all(f"https://u/{i}" in d for i in range(10))
+    assert "https://u/never" not in d
+    assert "" not in d
+
+
+def test_url_dedup_clear():
+    from redditcommand.utils.dedup import UrlDedup
+
+    d = UrlDedup()
+    d.add("https://a")
+    d.clear()
+    assert len(d) == 0
+    assert "https://a" not in d
+
+
+def test_url_dedup_ignores_tracking_params_and_fragments():
+    from redditcommand.utils.dedup import UrlDedup, canonical_url
+
+    d = UrlDedup()
+    d.add("https://i.imgur.com/abc.jpg?utm_source=reddit&share_id=x#top")
+
+    assert "https://I.IMGUR.com/abc.jpg" in d
+    assert "https://i.imgur.com/abc.jpg?ref=share" in d
+    assert canonical_url("https://preview.redd.it/a.jpg?width=640&s=sig&utm_medium=x") == (
+        "https://preview.redd.it/a.jpg?width=640&s=sig"
+    )
+    assert "https://preview.redd.it/a.jpg?width=320&s=other" not in d
@@ -23,6 +23,7 @@ def patch_reddit_client(monkeypatch):
 def deterministic_shuffle(monkeypatch):
     # Keep subreddits order stable in tests
     monkeypatch.setattr("random.shuffle", lambda x: None)
+    monkeypatch.setattr("random.sample", lambda seq, k: list(seq)[:k])
 
 # 1) Happy path across multiple subreddits, processed_urls and slicing enforced
 async def test_fetch_from_subreddits_happy(monkeypatch):
@@ -42,7 +43,7 @@ async def test_fetch_from_subreddits_happy(monkeypatch):
     # Filter passes through first N posts
     created_filters = []
     class FakeFilter:
-        def __init__(self, subreddit_name, media_type, media_count, processed_urls):
+        def __init__(self, subreddit_name, media_type, media_count, processed_urls, processed_post_ids=None):
             self.subreddit_name = subreddit_name
             self.media_type = media_type
             self.media_count = media_count
@@ -135,7 +136,7 @@ async def test_fetch_from_single_filters_and_uniques(monkeypatch):
     monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
 
     class PF:
-        def __init__(self, subreddit_name, media_type, media_count, processed_urls):
+        def __init__(self, subreddit_name, media_type, media_count, processed_urls, processed_post_ids=None):
             self.media_count = media_count
         async def filter(self, posts): return posts[: self.media_count]
     monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
@@ -177,8 +178,9 @@ async def test_fetch_from_subreddits_processed_urls_and_slice(monkeypatch):
     monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
 
     class PF:
-        def __init__(self, *a, **k): pass
-        async def filter(self, posts): return posts
+        def __init__(self, subreddit_name, media_type, media_count, processed_urls, processed_post_ids=None):
+            self.processed_urls = processed_urls
+        async def filter(self, posts): return [p for p in posts if p.url not in self.processed_urls]
     monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
 
     async def filter_duplicates(posts, processed_post_ids): return posts
@@ -208,7 +210,7 @@ async def test_invalid_subreddits_and_target_count(monkeypatch):
     monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
 
     class PF:
-        def __init__(self, subreddit_name, media_type, media_count, processed_urls):
+        def __init__(self, subreddit_name, media_type, media_count, processed_urls, processed_post_ids=None):
             self.media_count = media_count
         async def filter(self, posts): return posts[: self.media_count]
     monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
@@ -249,3 +251,168 @@ async def test_fetch_from_single_catches_exception(monkeypatch):
         processed_urls=set(),
     )
     assert res == []
+
+# 8) Once enough unique posts arrive, slower subreddit fetches are cancelled
+async def test_fetch_from_subreddits_cancels_slow_subreddits(monkeypatch):
+    from redditcommand import fetch as F
+
+    cancelled = []
+    async def get_posts(reddit, subreddit_name, **kwargs):
+        if subreddit_name == "slow":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(subreddit_name)
+                raise
+        return [
+            DummySubmission(f"{subreddit_name}-1", f"https://u/{subreddit_name}/1"),
+            DummySubmission(f"{subreddit_name}-2", f"https://u/{subreddit_name}/2"),
+        ], subreddit_name
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
+
+    class PF:
+        def __init__(self, *a, **k): pass
+        async def filter(self, posts): return posts
+    monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
+
+    async def filter_duplicates(posts, processed_post_ids): return posts
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.RedditPostFetcher.filter_duplicates", filter_duplicates)
+
+    fp = F.MediaPostFetcher()
+    out = await asyncio.wait_for(
+        fp.fetch_from_subreddits(["fast", "slow"], media_count=2),
+        timeout=2,
+    )
+    assert [p.url for p in out] == ["https://u/fast/1", "https://u/fast/2"]
+    assert cancelled == ["slow"]
+
+# 9) Multiple subreddits are fetched with one combined listing and bucketed per subreddit
+async def test_fetch_from_subreddits_uses_combined_listing(monkeypatch):
+    from redditcommand import fetch as F
+    from redditcommand.config import MediaConfig
+
+    def post(sub, n):
+        p = DummySubmission(f"{sub}-{n}", f"https://u/{sub}/{n}")
+        p.subreddit = types.SimpleNamespace(display_name=sub.capitalize())
+        return p
+
+    combined_calls = []
+    async def get_combined_posts(reddit, subreddit_names, search_terms, sort, time_filter, limit):
+        combined_calls.append((list(subreddit_names), limit))
+        return [post("a", 1), post("b", 1), post("a", 2)]
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_combined_posts", get_combined_posts)
+
+    async def get_posts(reddit, subreddit_name, **kwargs):
+        raise AssertionError("per-subreddit fetch should not run")
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
+
+    created = []
+    class PF:
+        def __init__(self, subreddit_name, media_type, media_count, processed_urls, processed_post_ids=None):
+            self.media_count = media_count
+            created.append(subreddit_name)
+        async def filter(self, posts): return posts[: self.media_count]
+    monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
+
+    fp = F.MediaPostFetcher()
+    emitted = []
+    out = await fp.fetch_from_subreddits(["a", "b"], media_count=2, on_posts=emitted.append)
+
+    # Sized from the two requested posts, not from the number of subreddits
+    assert combined_calls == [(["a", "b"], 2 * MediaConfig.COMBINED_OVERFETCH)]
+    assert emitted == out
+    assert created == ["a", "b"]
+    assert [p.url for p in out] == ["https://u/a/1", "https://u/b/1"]
+
+
+# 10) Caller's subreddit list is never reordered
+async def test_fetch_from_subreddits_does_not_mutate_input(monkeypatch):
+    from redditcommand import fetch as F
+
+    async def get_posts(reddit, subreddit_name, **kwargs):
+        return [DummySubmission(subreddit_name, f"https://u/{subreddit_name}")], subreddit_name
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
+
+    class PF:
+        def __init__(self, *a, **k): pass
+        async def filter(self, posts): return posts
+    monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
+
+    monkeypatch.setattr("random.sample", lambda seq, k: list(reversed(seq))[:k])
+
+    names = ["a", "b", "c"]
+    await F.MediaPostFetcher().fetch_from_subreddits(names, media_count=3)
+    assert names == ["a", "b", "c"]
+
+
+# 11) A subreddit the combined listing left short still gets its own fetch; unallocated ones are skipped
+async def test_combined_listing_only_covers_filled_allocations(monkeypatch):
+    from redditcommand import fetch as F
+
+    def post(sub, n):
+        p = DummySubmission(f"{sub}-{n}", f"https://u/{sub}/{n}")
+        p.subreddit = types.SimpleNamespace(display_name=sub)
+        return p
+
+    async def get_combined_posts(reddit, subreddit_names, **kwargs):
+        return [post("big", 1), post("big", 2), post("big", 3), post("idle", 1)]
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_combined_posts", get_combined_posts)
+
+    single = []
+    async def get_posts(reddit, subreddit_name, **kwargs):
+        single.append(subreddit_name)
+        return [post(subreddit_name, 9)], subreddit_name
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
+
+    created = []
+    class PF:
+        def __init__(self, subreddit_name, media_type, media_count, processed_urls, processed_post_ids=None):
+            self.media_count = media_count
+            created.append((subreddit_name, media_count, processed_post_ids is not None))
+        async def filter(self, posts): return posts[: self.media_count]
+    monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
+
+    monkeypatch.setattr("random.sample", lambda seq, k: list(seq)[:k])
+
+    out = await F.MediaPostFetcher().fetch_from_subreddits(["big", "small", "idle"], media_count=2)
+
+    assert single == ["small"]
+    assert created == [("big", 1, True), ("small", 1, True)]
+    assert sorted(p.url for p in out) == ["https://u/big/1", "https://u/small/9"]
+
+
+# 12) Only the part of an allocation the combined listing missed is fetched per subreddit
+async def test_combined_listing_shortfall_is_fetched_alone(monkeypatch):
+    from redditcommand import fetch as F
+    from redditcommand.config import MediaConfig
+
+    def post(sub, n):
+        p = DummySubmission(f"{sub}-{n}", f"https://u/{sub}/{n}")
+        p.subreddit = types.SimpleNamespace(display_name=sub)
+        return p
+
+    limits = []
+    async def get_combined_posts(reddit, subreddit_names, limit, **kwargs):
+        limits.append(limit)
+        return [post("big", 1), post("small", 1), post("small", 2), post("small", 3)]
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_combined_posts", get_combined_posts)
+
+    async def get_posts(reddit, subreddit_name, **kwargs):
+        return [post(subreddit_name, 8), post(subreddit_name, 9)], subreddit_name
+    monkeypatch.setattr("redditcommand.utils.fetch_utils.FetchOrchestrator.get_posts", get_posts)
+
+    created = []
+    class PF:
+        def __init__(self, subreddit_name, media_type, media_count, processed_urls, processed_post_ids=None):
+            self.media_count = media_count
+            created.append((subreddit_name, media_count))
+        async def filter(self, posts): return posts[: self.media_count]
+    monkeypatch.setattr("redditcommand.fetch.MediaPostFilter", PF)
+
+    monkeypatch.setattr("random.sample", lambda seq, k: list(seq)[:k])
+
+    out = await F.MediaPostFetcher().fetch_from_subreddits(["big", "small"], media_count=4)
+
+    assert limits == [min(4 * MediaConfig.COMBINED_OVERFETCH, MediaConfig.COMBINED_POST_LIMIT)]
+    assert created == [("big", 2), ("small", 2), ("big", 1)]
+    assert sorted(p.url for p in out) == ["https://u/big/1", "https://u/big/8", "https://u/small/1", "https://u/small/2"]
@@ -0,0 +1,75 @@
+# tests/test_file_state_utils.py
+import json
+import os
+
+
+def _filter_store(monkeypatch, tmp_path):
+    from redditcommand.utils.file_state_utils import FollowedUserStore
+
+    path = tmp_path / "filters.json"
+    monkeypatch.setattr(FollowedUserStore, "FILTER_MAP_PATH", str(path))
+    monkeypatch.setattr(FollowedUserStore, "_filters_cache", None)
+
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: loads.append(1) or real_load(f))
+    return FollowedUserStore, path, loads
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+# 1) The parsed filter map is reused until an outside rewrite changes the file's mtime or size
+def test_filter_cache_reloads_after_outside_rewrite(monkeypatch, tmp_path):
+    store, path, loads = _filter_store(monkeypatch, tmp_path)
+    path.write_text(json.dumps({"alice": ["cats"]}))
+
+    assert store.get_filters("alice") == ["cats"]
+    assert store.get_filters("alice") == ["cats"]
+    assert len(loads) == 1
+
+    # Same size, newer mtime
+    path.write_text(json.dumps({"alice": ["dogs"]}))
+    _bump_mtime(path)
+    assert store.get_filters("alice") == ["dogs"]
+    assert len(loads) == 2
+
+    # Different size, mtime forced back to the cached one
+    cached_mtime = os.stat(path).st_mtime_ns
+    path.write_text(json.dumps({"alice": ["dogs", "birds"]}))
+    os.utime(path, ns=(cached_mtime, cached_mtime))
+    assert store.get_filters("alice") == ["dogs", "birds"]
+    assert len(loads) == 3
+
+
+# 2) save_user_filters refreshes the cache from what it wrote, without reading the file back
+def test_save_user_filters_refreshes_cache(monkeypatch, tmp_path):
+    store, path, loads = _filter_store(monkeypatch, tmp_path)
+    path.write_text(json.dumps({"alice": ["cats"]}))
+    assert store.get_filters("alice") == ["cats"]
+
+    # Same size as before, so a coarse mtime alone could not tell the files apart
+    store.save_user_filters({"alice": ["dogs"]})
+    assert store.get_filters("alice") == ["dogs"]
+
+    store.set_filters("bob", [" Spoilers ", ""])
+    assert store.get_filters("bob") == ["spoilers"]
+    assert len(loads) == 1
+
+
+# 3) Callers get copies and cannot change the cached map
+def test_filter_cache_hands_out_copies(monkeypatch, tmp_path):
+    store, path, loads = _filter_store(monkeypatch, tmp_path)
+    path.write_text(json.dumps({"alice": ["cats"]}))
+
+    store.get_filters("alice").append("dogs")
+    store.load_user_filters()["alice"].append("birds")
+    assert store.get_filters("alice") == ["cats"]
+
+    saved = {"alice": ["cats"]}
+    store.save_user_filters(saved)
+    saved["alice"].append("dogs")
+    assert store.get_filters("alice") == ["cats"]
+    assert len(loads) == 1
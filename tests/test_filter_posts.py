@@ -89,7 +89,7 @@ async def test_filter_some_pass_and_sampling(monkeypatch):
     from redditcommand import filter_posts as FP
 
     # Deterministic sampling: return first N items
-    monkeypatch.setattr(FP, "sample", lambda seq, n: list(seq)[:n])
+    monkeypatch.setattr(FP, "randrange", lambda n: n)
 
     calls = {"attach_ids": []}
 
@@ -123,7 +123,7 @@ async def test_filter_media_count_caps_to_available(monkeypatch):
     from redditcommand import filter_posts as FP
 
     # Deterministic sampling
-    monkeypatch.setattr(FP, "sample", lambda seq, n: list(seq)[:n])
+    monkeypatch.setattr(FP, "randrange", lambda n: n)
 
     class FU:
         @staticmethod
@@ -169,7 +169,7 @@ async def test_filter_passes_processed_urls_to_should_skip(monkeypatch):
             pass
 
     monkeypatch.setattr(FP, "FilterUtils", FU)
-    monkeypatch.setattr(FP, "sample", lambda seq, n: list(seq)[:n])
+    monkeypatch.setattr(FP, "randrange", lambda n: n)
 
     processed = {"https://already/seen"}
     f = FP.MediaPostFilter(subreddit_name="s", media_type="video", media_count=1, processed_urls=processed)
@@ -180,3 +180,79 @@ async def test_filter_passes_processed_urls_to_should_skip(monkeypatch):
     # Ensure the same set instance is passed through
     assert seen["processed_urls_obj"] is processed
     assert seen["media_type"] == "video"
+
+
+async def test_filter_skips_processed_post_ids_before_sampling(monkeypatch):
+    from redditcommand import filter_posts as FP
+
+    class FU:
+        @staticmethod
+        def should_skip(post, processed_urls, media_type): return None
+        @staticmethod
+        async def attach_metadata(post): pass
+        @staticmethod
+        def log_skips(skipped_dict): pass
+
+    monkeypatch.setattr(FP, "FilterUtils", FU)
+    monkeypatch.setattr(FP, "randrange", lambda n: n)
+
+    posts = [DummySubmission("a", "u/a"), DummySubmission("b", "u/b"), DummySubmission("c", "u/c")]
+    f = FP.MediaPostFilter(subreddit_name="s", media_count=2, processed_post_ids={"a"})
+    out = await f.filter(posts)
+    # "a" was taken elsewhere, so both slots go to posts still available
+    assert [p.id for p in out] == ["b", "c"]
+
+
+async def test_url_classifiers():
+    from redditcommand.utils.url_utils import is_valid_media_url, matches_media_type
+
+    assert is_valid_media_url("https://i.redd.it/a.JPG")
+    assert is_valid_media_url("https://v.redd.it/abc")
+    assert not is_valid_media_url("https://example.com/post")
+    assert not is_valid_media_url("https://example.com/a.mp4?x=1")
+
+    assert matches_media_type("https://i.redd.it/a.png", "image")
+    assert not matches_media_type("https://i.redd.it/a.png", "video")
+    assert matches_media_type("https://v.redd.it/abc", "video")
+    assert matches_media_type("https://anything", None)
+
+
+async def test_media_skip_reason_order():
+    from redditcommand.config import SkipReasons
+    from redditcommand.utils.url_utils import media_skip_reason
+
+    assert media_skip_reason("https://example.com/post", None) == SkipReasons.NON_MEDIA
+    assert media_skip_reason("https://gfycat.com/x.mp4", None) == SkipReasons.GFYCAT
+    assert media_skip_reason("https://i.redd.it/a.png", "video") == SkipReasons.WRONG_TYPE
+    assert media_skip_reason("https://i.redd.it/a.png", "image") is None
+
+
+async def test_should_skip_ranks_non_media_before_processed():
+    from redditcommand.config import SkipReasons
+    from redditcommand.utils.filter_utils import FilterUtils
+
+    def post(url):
+        p = DummySubmission("p", url)
+        p.subreddit = types.SimpleNamespace(display_name="pics")
+        p.title, p.link_flair_text, p.score = "t", None, 1
+        return p
+
+    processed = {"https://i.redd.it/a.png", "https://example.com/page"}
+    assert FilterUtils.should_skip(post("https://i.redd.it/a.png"), processed, "video") == SkipReasons.PROCESSED
+    assert FilterUtils.should_skip(post("https://example.com/page"), processed, None) == SkipReasons.NON_MEDIA
+
+
+async def test_attach_metadata_handles_missing_title_and_plain_flair():
+    from redditcommand.utils.filter_utils import FilterUtils
+
+    post = DummySubmission("p1", "https://i.redd.it/a.png")
+    post.title = None
+    post.link_flair_text = " OC "
+    post.score = 5
+    post.author = None
+    post.subreddit = types.SimpleNamespace(display_name="pics")
+
+    await FilterUtils.attach_metadata(post)
+    assert post.metadata["title"] == "Unknown"
+    assert post.metadata["link_flair_text"] == "OC"
+    assert post.metadata["author"] == "[deleted]"
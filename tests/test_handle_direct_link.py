@@ -47,16 +47,16 @@ def stub_global_session_and_aiohttp(monkeypatch):
 
 # Helpers
 def _mk_tmpman(monkeypatch, mod, tmpdir):
-    # Common TempFileManager stub: create_temp_dir returns tmpdir, cleanup_file records calls
+    # Common TempFileManager stub: create_temp_dir returns tmpdir, acleanup records calls
     calls = {"cleaned": []}
     def create_temp_dir(prefix): return str(tmpdir)
     def extract_post_id_from_url(url): return "xid"
-    def cleanup_file(path): calls["cleaned"].append(path)
+    async def acleanup(path): calls["cleaned"].append(path)
     monkeypatch.setattr(mod, "TempFileManager",
         types.SimpleNamespace(
             create_temp_dir=create_temp_dir,
             extract_post_id_from_url=extract_post_id_from_url,
-            cleanup_file=cleanup_file
+            acleanup=acleanup
         )
     )
     return calls
@@ -218,16 +218,13 @@ async def test_ytdlp_success(monkeypatch, tmp_path):
     from redditcommand import handle_direct_link as hdl
     tmp_calls = _mk_tmpman(monkeypatch, hdl, tmp_path)
 
-    class FakeProc:
-        def __init__(self, rc=0): self.returncode = rc
-        async def communicate(self): return b"", b""
-    async def create_proc(*args, **kwargs): return FakeProc(rc=0)
+    async def fake_run(args, timeout): return 0, ""
 
     # Simulate yt-dlp creating the output file
     out_file = tmp_path / "reddit_xid.mp4"
     out_file.write_bytes(b"ok")
 
-    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_proc)
+    monkeypatch.setattr(hdl.YtDlpRunner, "run", staticmethod(fake_run))
 
     r = hdl.MediaLinkResolver()
     got = await r._download_with_ytdlp("https://youtu.be/x", "xid")
@@ -239,11 +236,8 @@ async def test_ytdlp_failure(monkeypatch, tmp_path):
     from redditcommand import handle_direct_link as hdl
     tmp_calls = _mk_tmpman(monkeypatch, hdl, tmp_path)
 
-    class FakeProc:
-        def __init__(self, rc=1): self.returncode = rc
-        async def communicate(self): return b"", b"boom"
-    async def create_proc(*a, **k): return FakeProc(rc=1)
-    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_proc)
+    async def fake_run(args, timeout): return 1, "boom"
+    monkeypatch.setattr(hdl.YtDlpRunner, "run", staticmethod(fake_run))
 
     r = hdl.MediaLinkResolver()
     got = await r._download_with_ytdlp("https://youtu.be/x", "xid")
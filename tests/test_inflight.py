@@ -0,0 +1,84 @@
+# tests/test_inflight.py
+import asyncio
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_coalesce_shares_inflight_call_and_caches_result():
+    from redditcommand.utils.inflight import coalesce
+
+    calls = []
+
+    @coalesce(key=lambda name: name, ttl=30)
+    async def load(name):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return [name]
+
+    a, b = await asyncio.gather(load("cats"), load("cats"))
+    c = await load("cats")
+    d = await load("dogs")
+
+    assert a == b == c == ["cats"]
+    assert d == ["dogs"]
+    assert calls == ["cats", "dogs"]
+
+
+async def test_coalesce_does_not_cache_failures_or_bypassed_keys():
+    from redditcommand.utils.inflight import coalesce
+
+    calls = {"n": 0}
+
+    @coalesce(key=lambda name: None if name == "random" else name)
+    async def load(name):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("boom")
+        return [name]
+
+    with pytest.raises(RuntimeError):
+        await load("cats")
+    assert await load("cats") == ["cats"]
+    await load("random")
+    await load("random")
+    assert calls["n"] == 4
+
+
+async def test_coalesce_cache_pop_forces_reload():
+    from redditcommand.utils.inflight import coalesce
+
+    calls = []
+
+    @coalesce(key=lambda name: name.lower(), ttl=3600)
+    async def load(name):
+        calls.append(name)
+        return name
+
+    await load("Cats")
+    await load("cats")
+    load.cache_pop("CATS")
+    await load("cats")
+    assert calls == ["Cats", "cats"]
+
+
+async def test_coalesce_waiter_survives_leader_cancellation():
+    from redditcommand.utils.inflight import coalesce
+
+    calls = []
+
+    @coalesce(key=lambda name: name)
+    async def load(name):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return [name]
+
+    leader = asyncio.create_task(load("x"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(load("x"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == ["x"]
+    assert leader.cancelled()
+    assert calls == ["x", "x"]
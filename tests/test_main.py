@@ -2,6 +2,7 @@
 import types
 import importlib.util
 import pathlib
+import dataclasses
 import pytest
 import os
 
@@ -60,6 +61,10 @@ def fake_registrar(monkeypatch):
     monkeypatch.setattr(regist, "TelegramRegistrar", R)
     return calls
 
+def set_settings(monkeypatch, **overrides):
+    import redditcommand.config as config
+    monkeypatch.setattr(config, "SETTINGS", dataclasses.replace(config.SETTINGS, **overrides))
+
 def import_main_fresh(monkeypatch):
     # Never load .env during tests
     import dotenv
@@ -76,6 +81,7 @@ def test_main_missing_env_vars(clear_env, fake_log_manager, fake_application, fa
     # Force empty values regardless of the shell
     monkeypatch.setenv("TELEGRAM_API_KEY", "")
     monkeypatch.setenv("TELEGRAM_CHAT_ID", "")
+    set_settings(monkeypatch, telegram_api_key="", telegram_chat_id=None)
 
     mod = import_main_fresh(monkeypatch)
     mod.main()
@@ -87,6 +93,7 @@ def test_main_missing_env_vars(clear_env, fake_log_manager, fake_application, fa
 def test_main_happy_path(fake_log_manager, fake_application, fake_registrar, monkeypatch):
     monkeypatch.setenv("TELEGRAM_API_KEY", "abc")
     monkeypatch.setenv("TELEGRAM_CHAT_ID", "707296886")
+    set_settings(monkeypatch, telegram_api_key="abc", telegram_chat_id=707296886)
 
     mod = import_main_fresh(monkeypatch)
     mod.main()
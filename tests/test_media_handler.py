@@ -109,10 +109,10 @@ async def test_download_and_validate_media_too_large(monkeypatch, tmp_path):
                         staticmethod(validate_and_compress))
 
     cleaned = {"called": False}
-    def cleanup(path): cleaned["called"] = True
+    async def cleanup(path): cleaned["called"] = True
     # Patch the symbol used by media_handler, not the utils module
     monkeypatch.setattr(mh, "TempFileManager",
-                        types.SimpleNamespace(cleanup_file=cleanup))
+                        types.SimpleNamespace(acleanup=cleanup))
 
     proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
     out = await proc.download_and_validate_media("http://x/big.mp4", "p1")
@@ -193,11 +193,10 @@ async def test_process_batch_filters_non_submission(monkeypatch):
     from redditcommand import media_handler as mh
     monkeypatch.setattr(mh, "Submission", DummySubmission)
 
-    async def fake_single(self, obj, *a, **k):
-        if isinstance(obj, DummySubmission):
-            return obj
-        return "not-a-submission"
-    monkeypatch.setattr(mh.MediaProcessor, "process_single", fake_single, raising=False)
+    async def fake_prepare(self, obj, *a, **k): return "f.mp4", None
+    async def fake_upload(self, file_path, target, caption): return True
+    monkeypatch.setattr(mh.MediaProcessor, "prepare_single", fake_prepare, raising=False)
+    monkeypatch.setattr(mh.MediaProcessor, "upload_media", fake_upload, raising=False)
 
     proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
     items = [DummySubmission("1", "u"), object()]
@@ -223,7 +222,7 @@ async def test_resolve_media_url_tmp_fast_path(monkeypatch, tmp_path):
 # 11) resolve_media_url: gallery branch
 async def test_resolve_media_url_gallery(monkeypatch):
     from redditcommand import media_handler as mh
-    async def resolve_gallery(gid, reddit): return "https://resolved/gallery.mp4"
+    async def resolve_gallery(gid, reddit, post=None): return "https://resolved/gallery.mp4"
     monkeypatch.setattr("redditcommand.utils.media_utils.MediaUtils.resolve_reddit_gallery", staticmethod(resolve_gallery))
 
     proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
@@ -284,9 +283,9 @@ async def test_upload_media_generic_exception(monkeypatch):
     monkeypatch.setattr("redditcommand.utils.media_utils.MediaSender.determine_type", staticmethod(lambda p: handler))
 
     cleaned = {"count": 0}
-    def cleanup(p): cleaned["count"] += 1
+    async def cleanup(p): cleaned["count"] += 1
     monkeypatch.setattr(mh, "TempFileManager",
-                        types.SimpleNamespace(cleanup_file=cleanup))
+                        types.SimpleNamespace(acleanup=cleanup))
 
     ok = await mh.MediaProcessor(reddit=object(), update=DummyUpdate()).upload_media("x.mp4", target=object(), caption=None)
     assert ok is False
@@ -308,9 +307,9 @@ async def test_upload_media_succeeds_on_second_attempt(monkeypatch):
     monkeypatch.setattr("redditcommand.utils.media_utils.MediaSender.determine_type", staticmethod(lambda p: handler))
 
     cleaned = {"count": 0}
-    def cleanup(p): cleaned["count"] += 1
+    async def cleanup(p): cleaned["count"] += 1
     monkeypatch.setattr(mh, "TempFileManager",
-                        types.SimpleNamespace(cleanup_file=cleanup))
+                        types.SimpleNamespace(acleanup=cleanup))
 
     ok = await mh.MediaProcessor(reddit=object(), update=DummyUpdate()).upload_media("x.mp4", target=object(), caption=None)
     assert ok is True
@@ -331,13 +330,179 @@ async def test_process_batch_with_exception(monkeypatch):
     from redditcommand import media_handler as mh
     monkeypatch.setattr(mh, "Submission", DummySubmission)
 
-    async def fake_single(self, obj, *a, **k):
+    async def fake_prepare(self, obj, *a, **k):
         if isinstance(obj, DummySubmission):
-            return obj
+            return "f.mp4", None
         raise RuntimeError("boom")
-    monkeypatch.setattr(mh.MediaProcessor, "process_single", fake_single, raising=False)
+    async def fake_upload(self, file_path, target, caption): return True
+    monkeypatch.setattr(mh.MediaProcessor, "prepare_single", fake_prepare, raising=False)
+    monkeypatch.setattr(mh.MediaProcessor, "upload_media", fake_upload, raising=False)
 
     proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
     items = [DummySubmission("ok", "u"), object()]
     out = await proc.process_batch(items, False, False, False)
     assert len(out) == 1 and isinstance(out[0], DummySubmission)
+
+# 18) download_file: http .gifv goes through the same mp4 conversion as .gif
+async def test_download_file_http_gifv(monkeypatch, tmp_path):
+    from redditcommand import media_handler as mh
+    proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
+
+    td = tmp_path / "tmpdir"
+    td.mkdir()
+    monkeypatch.setattr("redditcommand.utils.tempfile_utils.TempFileManager.create_temp_dir", lambda prefix: str(td))
+
+    async def dl(url, out):
+        Path(out).write_bytes(b"\x00\x00\x00\x18ftypmp42")
+        return out
+    monkeypatch.setattr("redditcommand.utils.media_utils.MediaDownloader.download_file", staticmethod(dl))
+
+    converted = []
+    async def convert_gif_to_mp4(p):
+        converted.append(p)
+        return str(td / "reddit_pid.mp4")
+    monkeypatch.setattr("redditcommand.utils.media_utils.MediaUtils.convert_gif_to_mp4", staticmethod(convert_gif_to_mp4))
+    monkeypatch.setattr("redditcommand.utils.tempfile_utils.TempFileManager.cleanup_file", lambda p: None)
+
+    out = await proc.download_file("https://example.com/abc.gifv", post_id="pid")
+    assert converted == [str(td / "reddit_pid.gifv")]
+    assert out == str(td / "reddit_pid.mp4")
+
+# 19) process_batch: downloads and uploads are bounded separately and overlap
+async def test_process_batch_bounded_concurrency(monkeypatch):
+    from redditcommand import media_handler as mh
+    monkeypatch.setattr(mh, "Submission", DummySubmission)
+    monkeypatch.setattr(mh.MediaConfig, "DOWNLOAD_CONCURRENCY", 3)
+    monkeypatch.setattr(mh.MediaConfig, "UPLOAD_CONCURRENCY", 2)
+
+    state = {"dl": 0, "dl_peak": 0, "up": 0, "up_peak": 0, "overlap": False}
+    async def fake_prepare(self, obj, *a, **k):
+        state["dl"] += 1
+        state["dl_peak"] = max(state["dl_peak"], state["dl"])
+        state["overlap"] |= state["up"] > 0
+        await asyncio.sleep(0.01)
+        state["dl"] -= 1
+        return f"{obj.id}.mp4", None
+    async def fake_upload(self, file_path, target, caption):
+        state["up"] += 1
+        state["up_peak"] = max(state["up_peak"], state["up"])
+        await asyncio.sleep(0.01)
+        state["up"] -= 1
+        return True
+    monkeypatch.setattr(mh.MediaProcessor, "prepare_single", fake_prepare, raising=False)
+    monkeypatch.setattr(mh.MediaProcessor, "upload_media", fake_upload, raising=False)
+
+    proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
+    items = [DummySubmission(str(i), "u") for i in range(8)]
+    out = await proc.process_batch(items, False, False, False)
+    assert sorted(p.id for p in out) == [str(i) for i in range(8)]
+    assert state["dl_peak"] == 3 and state["up_peak"] == 2
+    assert state["overlap"] is True
+
+# 20) upload_media: backs off between failed attempts and never retries a BadRequest
+async def test_upload_media_backoff_and_bad_request(monkeypatch):
+    from telegram.error import BadRequest
+    from redditcommand import media_handler as mh
+    monkeypatch.setattr(mh.RetryConfig, "RETRY_ATTEMPTS", 3)
+    async def no_cleanup(p): pass
+    monkeypatch.setattr(mh, "TempFileManager", types.SimpleNamespace(acleanup=no_cleanup))
+
+    delays = []
+    async def fake_sleep(d): delays.append(d)
+    monkeypatch.setattr(mh.asyncio, "sleep", fake_sleep)
+
+    calls = {"n": 0}
+    async def flaky(file_path, target, caption=None):
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise RuntimeError("flaky")
+    monkeypatch.setattr(mh.MediaSender, "determine_type_and_send", staticmethod(lambda p: flaky))
+
+    proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
+    assert await proc.upload_media("x.mp4", target=object(), caption=None) is True
+    assert calls["n"] == 3 and len(delays) == 2
+    assert delays[1] - delays[0] > 0  # base delay doubles; jitter is under a second
+
+    async def rejected(file_path, target, caption=None):
+        calls["n"] += 1
+        raise BadRequest("File too large")
+    monkeypatch.setattr(mh.MediaSender, "determine_type_and_send", staticmethod(lambda p: rejected))
+
+    calls["n"] = 0
+    delays.clear()
+    assert await proc.upload_media("x.mp4", target=object(), caption=None) is False
+    assert calls["n"] == 1 and delays == []
+
+# 21) resolve_reddit_gallery: uses the listing's own gallery data without fetching the submission
+async def test_resolve_reddit_gallery_uses_listing_data():
+    from redditcommand.utils.media_utils import MediaUtils
+
+    class NoFetchReddit:
+        async def submission(self, id):
+            raise AssertionError("should not fetch")
+
+    post = DummySubmission("abc123", "https://www.reddit.com/gallery/abc123")
+    post.gallery_data = {"items": [{"media_id": "m1"}, {"media_id": "m2"}]}
+    post.media_metadata = {"m1": {"status": "failed"}, "m2": {"s": {"u": "https://preview.redd.it/m2.jpg?a=1&amp;b=2"}}}
+
+    out = await MediaUtils.resolve_reddit_gallery("abc123", NoFetchReddit(), post=post)
+    assert out == "https://preview.redd.it/m2.jpg?a=1&b=2"
+
+# 22) Small direct photos are sent by URL; a URL Telegram cannot fetch falls back to download + upload
+async def test_send_by_url_and_fallback(monkeypatch):
+    from telegram.error import BadRequest
+    from redditcommand import media_handler as mh
+    async def no_cleanup(p): pass
+    monkeypatch.setattr(mh, "TempFileManager", types.SimpleNamespace(acleanup=no_cleanup))
+
+    async def small(url, session=None, headers=None): return 1024
+    monkeypatch.setattr(mh.MediaDownloader, "content_length", staticmethod(small))
+
+    proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
+    assert await proc.can_send_by_url("https://i.redd.it/a.jpg") is True
+    assert await proc.can_send_by_url("https://i.redd.it/a.gif") is False
+    # Videos are downloaded so send_video can pass their dimensions
+    assert await proc.can_send_by_url("https://i.redd.it/a.mp4") is False
+
+    sent = []
+    async def send_url(url, target, caption=None): sent.append(url)
+    monkeypatch.setattr(mh.MediaSender, "send_url", staticmethod(send_url))
+    assert await proc.upload_media("https://i.redd.it/a.jpg", target=object(), caption=None) is True
+    assert sent == ["https://i.redd.it/a.jpg"]
+
+    async def refuse(url, target, caption=None): raise BadRequest("Wrong file identifier/http url specified")
+    monkeypatch.setattr(mh.MediaSender, "send_url", staticmethod(refuse))
+    async def download(self, url, post_id=None): return "/tmp/a.jpg"
+    monkeypatch.setattr(mh.MediaProcessor, "download_and_validate_media", download)
+    uploaded = []
+    async def send_file(file_path, target, caption=None): uploaded.append(file_path)
+    monkeypatch.setattr(mh.MediaSender, "determine_type_and_send", staticmethod(lambda p: send_file))
+
+    assert await proc.upload_media("https://i.redd.it/a.jpg", target=object(), caption=None) is True
+    assert uploaded == ["/tmp/a.jpg"]
+
+# 23) process_batch: posts from an async stream are sent before the stream is exhausted
+async def test_process_batch_consumes_stream(monkeypatch):
+    from redditcommand import media_handler as mh
+    monkeypatch.setattr(mh, "Submission", DummySubmission)
+
+    uploaded = []
+    async def fake_prepare(self, obj, *a, **k): return f"{obj.id}.mp4", None
+    async def fake_upload(self, file_path, target, caption):
+        uploaded.append(file_path)
+        return True
+    monkeypatch.setattr(mh.MediaProcessor, "prepare_single", fake_prepare, raising=False)
+    monkeypatch.setattr(mh.MediaProcessor, "upload_media", fake_upload, raising=False)
+
+    seen_before_second = []
+    async def stream():
+        yield DummySubmission("1", "u")
+        for _ in range(5):
+            await asyncio.sleep(0)
+        seen_before_second.extend(uploaded)
+        yield DummySubmission("2", "u")
+
+    proc = mh.MediaProcessor(reddit=object(), update=DummyUpdate())
+    out = await proc.process_batch(stream(), False, False, False)
+    assert [p.id for p in out] == ["1", "2"]
+    assert seen_before_second == ["1.mp4"]
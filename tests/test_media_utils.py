@@ -0,0 +1,281 @@
+# tests/test_media_utils.py
+import asyncio
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def box(kind, payload=b""):
+    # One MP4 box: 32-bit size, four-letter type, payload
+    return (8 + len(payload)).to_bytes(4, "big") + kind + payload
+
+
+# 1) convert_gif_to_mp4: an MP4 payload behind a .gifv name is renamed without ffmpeg
+async def test_convert_gif_to_mp4_renames_mp4_container(fake_subprocess, tmp_path):
+    from redditcommand.utils import media_utils as MU
+
+    src = tmp_path / "reddit_x.gifv"
+    src.write_bytes(b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 32)
+
+    out = await MU.MediaUtils.convert_gif_to_mp4(str(src))
+    assert out == str(tmp_path / "reddit_x.mp4")
+    assert not src.exists()
+    assert fake_subprocess.commands == []  # ffmpeg never ran
+
+
+# 2) convert_gif_to_mp4: real GIFs are re-encoded (no stream copy attempt)
+async def test_convert_gif_to_mp4_reencodes_real_gif(monkeypatch, fake_subprocess, tmp_path):
+    from redditcommand.utils import media_utils as MU
+    from redditcommand.utils.ffmpeg_runner import FFmpegRunner
+
+    monkeypatch.setattr(FFmpegRunner, "_encoders", frozenset())
+    src = tmp_path / "reddit_y.gif"
+    src.write_bytes(b"GIF89a" + b"\x00" * 32)
+    commands = fake_subprocess.commands
+
+    out = await MU.MediaUtils.convert_gif_to_mp4(str(src))
+    assert out == str(tmp_path / "reddit_y.mp4")
+    assert len(commands) == 1 and "copy" not in commands[0]
+
+
+
+# 3) convert_gif_to_mp4: MP4 with moov after mdat is stream-copied with faststart, not re-encoded
+async def test_convert_gif_to_mp4_faststarts_trailing_moov(fake_subprocess, tmp_path):
+    from redditcommand.utils import media_utils as MU
+
+    src = tmp_path / "reddit_z.gifv"
+    src.write_bytes(box(b"ftyp", b"isom\x00\x00\x02\x00") + box(b"mdat", b"\x00" * 64) + box(b"moov", b"\x00" * 16))
+    commands = fake_subprocess.commands
+
+    out = await MU.MediaUtils.convert_gif_to_mp4(str(src))
+    assert out == str(tmp_path / "reddit_z.mp4")
+    assert len(commands) == 1
+    assert "copy" in commands[0] and "+faststart" in commands[0]
+
+
+# 4) find_first_valid_url: returns the best working candidate without waiting on worse ones
+async def test_find_first_valid_url_prefers_order_and_cancels_rest():
+    from redditcommand.utils import media_utils as MU
+
+    statuses = {"a": 404, "b": 200, "c": None}  # c never answers
+    cancelled = []
+
+    class Resp:
+        def __init__(self, status): self.status = status
+        async def __aenter__(self): return self
+        async def __aexit__(self, *exc): return False
+
+    class Ctx:
+        def __init__(self, url): self.url = url
+        async def __aenter__(self):
+            if statuses[self.url] is None:
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    cancelled.append(self.url)
+                    raise
+            return Resp(statuses[self.url])
+        async def __aexit__(self, *exc): return False
+
+    class FakeSession:
+        def head(self, url, **kw): return Ctx(url)
+        def get(self, url, **kw): return Ctx(url)
+
+    got = await asyncio.wait_for(MU.MediaDownloader.find_first_valid_url(["a", "b", "c"], session=FakeSession()), 1)
+    await asyncio.sleep(0)
+    assert got == "b"
+    assert cancelled == ["c"]
+
+
+# 5) _probe_dimensions: MP4 track header is read directly, no decoder is involved
+async def test_probe_dimensions_reads_mp4_tkhd(monkeypatch, tmp_path):
+    import sys
+    from redditcommand.utils import media_utils as MU
+
+    def tkhd(width, height):
+        return box(b"tkhd", b"\x00" * 76 + (width << 16).to_bytes(4, "big") + (height << 16).to_bytes(4, "big"))
+
+    moov = box(b"moov", box(b"trak", tkhd(0, 0)) + box(b"trak", tkhd(640, 360)))
+    src = tmp_path / "v.mp4"
+    src.write_bytes(box(b"ftyp", b"isom\x00\x00\x02\x00") + box(b"mdat", b"\x00" * 32) + moov)
+
+    monkeypatch.setitem(sys.modules, "cv2", None)
+    assert MU.MediaSender._probe_dimensions(str(src)) == (640, 360)
+
+
+# 6) determine_type_and_send: exact extension match (no substring hits on ".mp4")
+async def test_determine_type_and_send_exact_extensions():
+    from redditcommand.utils import media_utils as MU
+
+    send = MU.MediaSender.determine_type_and_send
+    assert send("/tmp/a.MP4") is MU.MediaSender.send_video
+    assert send("/tmp/a.jpeg") is MU.MediaSender.send_photo
+    assert send("/tmp/noext") is None
+    assert send("/tmp/a.mp") is None
+    assert send("/tmp/clip #2?.mp4") is MU.MediaSender.send_video
+
+
+# 7) download_file: a transfer that breaks off is resumed with a Range request
+async def test_download_file_resumes_with_range(tmp_path):
+    import aiohttp
+    from redditcommand.utils import media_utils as MU
+
+    seen_headers = []
+
+    class Content:
+        def __init__(self, chunks, fail): self.chunks, self.fail = chunks, fail
+        async def iter_chunked(self, size):
+            for c in self.chunks:
+                yield c
+            if self.fail:
+                raise aiohttp.ClientPayloadError("connection dropped")
+
+    class Resp:
+        def __init__(self, status, chunks, fail=False):
+            self.status, self.headers, self.content = status, {}, Content(chunks, fail)
+        async def __aenter__(self): return self
+        async def __aexit__(self, *exc): return False
+
+    class FakeSession:
+        def get(self, url, headers=None, timeout=None):
+            seen_headers.append(headers)
+            if not headers:
+                return Resp(200, [b"abc", b"def"], fail=True)
+            return Resp(206, [b"ghi"])
+
+    out = tmp_path / "v.mp4"
+    got = await MU.MediaDownloader.download_file("https://v.redd.it/x/DASH_720.mp4", str(out), session=FakeSession())
+    assert got == str(out)
+    assert out.read_bytes() == b"abcdefghi"
+    assert seen_headers == [None, {"Range": "bytes=6-"}]
+
+
+# 8) FFmpegRunner: never runs more ffmpeg processes at once than FFMPEG_CONCURRENCY
+async def test_ffmpeg_runner_caps_concurrency(monkeypatch, fake_subprocess):
+    from redditcommand.utils.ffmpeg_runner import FFmpegRunner
+
+    monkeypatch.setattr(FFmpegRunner, "_slots", asyncio.Semaphore(2))
+    state = {"running": 0, "peak": 0}
+
+    class SlowProc(fake_subprocess.proc):
+        async def communicate(self):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            return b"", b""
+    fake_subprocess.respond = lambda args: SlowProc()
+
+    results = await asyncio.gather(*(FFmpegRunner.run(["ffmpeg"]) for _ in range(5)))
+    assert results == [(0, b"")] * 5
+    assert state["peak"] == 2
+
+
+# 9) fetch_top_comment: skips blacklisted text (any case), walls of text and MoreComments placeholders
+async def test_fetch_top_comment_filters(monkeypatch):
+    import types
+    from redditcommand.utils.media_utils import MediaUtils
+
+    comments = [
+        types.SimpleNamespace(body="SAUCE please"),
+        types.SimpleNamespace(count=12),  # MoreComments has no body
+        types.SimpleNamespace(body="see WWW.example.org"),
+        types.SimpleNamespace(body="copypasta " * 500),
+        types.SimpleNamespace(body="great shot"),
+    ]
+    class Forest:
+        async def __call__(self): return self
+        def list(self): return comments
+    post = types.SimpleNamespace(comments=Forest())
+
+    assert await MediaUtils.fetch_top_comment(post) == "great shot"
+    assert (post.comment_sort, post.comment_limit) == ("top", 10)
+
+
+# 10) send_video: non-MP4 containers get their size from ffprobe metadata
+async def test_send_video_falls_back_to_ffprobe(fake_subprocess, tmp_path):
+    from redditcommand.utils import media_utils as MU
+    from redditcommand.utils.ffmpeg_runner import FFmpegRunner
+
+    src = tmp_path / "v.webm"
+    src.write_bytes(b"\x1aE\xdf\xa3" + b"\x00" * 32)
+
+    fake_subprocess.respond = lambda args: fake_subprocess.proc(stdout=b"1280x720\n")
+    calls = fake_subprocess.commands
+
+    sent = {}
+    class Bot:
+        async def send_video(self, **kw): sent.update(kw)
+
+    await MU.MediaSender.send_video(str(src), (Bot(), 1))
+    assert calls[0][0] == "ffprobe" and "stream=width,height" in calls[0]
+    assert (sent["width"], sent["height"]) == (1280, 720)
+
+
+# 11) convert_gif_to_mp4: uses the hardware encoder when listed, falls back to libx264 once it fails
+async def test_convert_gif_to_mp4_hw_encoder_fallback(monkeypatch, fake_subprocess, tmp_path):
+    from redditcommand.utils import media_utils as MU
+    from redditcommand.utils.ffmpeg_runner import FFmpegRunner
+
+    monkeypatch.setattr(FFmpegRunner, "_encoders", None)
+    src = tmp_path / "reddit_h.gif"
+    src.write_bytes(b"GIF89a" + b"\x00" * 32)
+
+    def respond(args):
+        if "-encoders" in args:
+            return fake_subprocess.proc(stdout=b" V....D h264_nvenc   NVIDIA NVENC H.264 encoder\n")
+        return fake_subprocess.proc(returncode=1 if "h264_nvenc" in args else 0)
+    fake_subprocess.respond = respond
+    commands = fake_subprocess.commands
+
+    out = await MU.MediaUtils.convert_gif_to_mp4(str(src))
+    assert out == str(tmp_path / "reddit_h.mp4")
+    assert "-encoders" in commands[0] and "h264_nvenc" in commands[1]
+    assert "h264_nvenc" not in commands[2]
+    assert not await FFmpegRunner.has_encoder("h264_nvenc")
+
+
+# 12) fetch_top_comment: a post's comment is fetched once and reused for repeat sends
+async def test_fetch_top_comment_cached_per_post():
+    import types
+    from redditcommand.utils.media_utils import MediaUtils
+
+    loads = []
+    class Forest:
+        async def __call__(self):
+            loads.append(1)
+            return self
+        def list(self): return [types.SimpleNamespace(body="nice")]
+    post = types.SimpleNamespace(id="cmt1", comments=Forest())
+
+    MediaUtils.fetch_top_comment.cache_clear()
+    assert await MediaUtils.fetch_top_comment(post) == "nice"
+    assert await MediaUtils.fetch_top_comment(post) == "nice"
+    assert len(loads) == 1
+    MediaUtils.fetch_top_comment.cache_clear()
+
+
+# 13) FFmpegRunner: ffprobe does not wait for a slot held by long encodes
+async def test_ffmpeg_runner_probes_skip_encode_slots(monkeypatch, fake_subprocess):
+    from redditcommand.utils.ffmpeg_runner import FFmpegRunner
+
+    slots = asyncio.Semaphore(1)
+    monkeypatch.setattr(FFmpegRunner, "_slots", slots)
+    fake_subprocess.respond = lambda args: fake_subprocess.proc(stdout=b"12.5\n")
+
+    async with slots:  # an encode holds every slot
+        duration = await asyncio.wait_for(FFmpegRunner.probe_duration("in.mp4"), timeout=1)
+    assert duration == 12.5
+
+
+# 14) FFmpegRunner: encodes are reniced, probes keep normal priority
+async def test_ffmpeg_runner_renices_encodes_only(monkeypatch, fake_subprocess):
+    from redditcommand.utils.ffmpeg_runner import FFmpegRunner
+
+    reniced = []
+    monkeypatch.setattr(FFmpegRunner, "_lower_priority", staticmethod(lambda pid: reniced.append(pid)))
+
+    await FFmpegRunner.probe_dimensions("in.webm")
+    assert reniced == []
+    await FFmpegRunner.run(["ffmpeg", "-i", "in.webm", "out.mp4"])
+    assert len(reniced) == 1
@@ -181,7 +181,10 @@ async def test_pipeline_retries_then_success(monkeypatch):
     # Speed up test by reducing attempts
     monkeypatch.setattr(P.RetryConfig, "RETRY_ATTEMPTS", 3)
     monkeypatch.setattr(P, "asyncio",
-        type("A", (), {"Semaphore": P.asyncio.Semaphore, "sleep": staticmethod(fake_sleep)})
+        type("A", (), {
+            "Semaphore": P.asyncio.Semaphore, "Queue": P.asyncio.Queue,
+            "create_task": staticmethod(P.asyncio.create_task), "sleep": staticmethod(fake_sleep),
+        })
     )
 
     class Fetcher:
@@ -193,14 +196,16 @@ async def test_pipeline_retries_then_success(monkeypatch):
                 seq["i"] += 1
                 return []
             # Second call returns one post -> success
-            return [DummyPost("https://ok/1")]
+            post = DummyPost("https://ok/1")
+            k["on_posts"](post)
+            return [post]
     monkeypatch.setattr(P, "MediaPostFetcher", lambda sem: Fetcher())
 
     class Proc:
         def __init__(self, r, u): pass
         async def __aenter__(self): return self
         async def __aexit__(self, *a): pass
-        async def process_batch(self, posts, **k): return posts
+        async def process_batch(self, posts, **k): return [p async for p in posts]
     monkeypatch.setattr(P, "MediaProcessor", Proc)
 
     pl = P.RedditMediaPipeline(
@@ -216,6 +221,53 @@ async def test_pipeline_retries_then_success(monkeypatch):
     assert pl.total_processed == 1
 
 
+async def test_pipeline_no_sleep_after_last_attempt(monkeypatch):
+    from redditcommand import pipeline as P
+
+    seq = {"sleeps": 0, "fetch_calls": 0}
+
+    async def init_client(getter): return "reddit"
+    async def validate(update, reddit, subs): return ["sub"]
+    async def fake_sleep(_): seq["sleeps"] += 1
+    async def notify(*a, **k): pass
+
+    monkeypatch.setattr(P, "PipelineHelper",
+        type("PH", (), {
+            "initialize_client": staticmethod(init_client),
+            "validate_subreddits": staticmethod(validate),
+            "notify_user": staticmethod(notify),
+            "notify_completion": staticmethod(notify),
+        })
+    )
+    monkeypatch.setattr(P.RetryConfig, "RETRY_ATTEMPTS", 2)
+    monkeypatch.setattr(P, "asyncio",
+        type("A", (), {
+            "Semaphore": P.asyncio.Semaphore, "Queue": P.asyncio.Queue,
+            "create_task": staticmethod(P.asyncio.create_task), "sleep": staticmethod(fake_sleep),
+        })
+    )
+
+    class Fetcher:
+        async def init_client(self): pass
+        async def fetch_from_subreddits(self, *a, **k):
+            seq["fetch_calls"] += 1
+            return []
+    monkeypatch.setattr(P, "MediaPostFetcher", lambda sem: Fetcher())
+
+    class Proc:
+        def __init__(self, r, u): pass
+        async def __aenter__(self): return self
+        async def __aexit__(self, *a): pass
+        async def process_batch(self, posts, **k): return [p async for p in posts]
+    monkeypatch.setattr(P, "MediaProcessor", Proc)
+
+    pl = P.RedditMediaPipeline(update=DummyUpdate(), subreddit_names=["sub"], search_terms=[], media_count=1)
+    await pl.run()
+
+    # Two empty fetches, but only the first one is followed by a backoff
+    assert seq["fetch_calls"] == 2
+    assert seq["sleeps"] == 1
+
 async def test_pipeline_processed_urls_cache_clears(monkeypatch):
     from redditcommand import pipeline as P
 
@@ -241,14 +293,17 @@ async def test_pipeline_processed_urls_cache_clears(monkeypatch):
         async def init_client(self): pass
         async def fetch_from_subreddits(self, *a, **k):
             # Return 4 unique posts so len(processed_urls) becomes 4 > 3
-            return [DummyPost(f"https://p/{i}") for i in range(4)]
+            posts = [DummyPost(f"https://p/{i}") for i in range(4)]
+            for post in posts:
+                k["on_posts"](post)
+            return posts
     monkeypatch.setattr(P, "MediaPostFetcher", lambda sem: Fetcher())
 
     class Proc:
         def __init__(self, r, u): pass
         async def __aenter__(self): return self
         async def __aexit__(self, *a): pass
-        async def process_batch(self, posts, **k): return posts  # mark all as sent
+        async def process_batch(self, posts, **k): return [p async for p in posts]  # mark all as sent
     monkeypatch.setattr(P, "MediaProcessor", Proc)
 
     pl = P.RedditMediaPipeline(
@@ -261,3 +316,32 @@ async def test_pipeline_processed_urls_cache_clears(monkeypatch):
 
     # Cache should have been cleared after exceeding 3
     assert len(pl.processed_urls) == 0
+
+
+async def test_validate_subreddits_loads_concurrently_in_order(monkeypatch):
+    import asyncio
+    from redditcommand.utils import pipeline_utils as PU
+
+    state = {"active": 0, "peak": 0}
+    client = object()
+    async def load(name, reddit=None):
+        assert reddit is client
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        if name == "bad":
+            raise RuntimeError("Redirect")
+    monkeypatch.setattr(PU.SubredditFetcher, "load", staticmethod(load))
+
+    from redditcommand.utils.rate_limiter import REDDIT_PACER
+    paced = []
+    async def wait():
+        paced.append(1)
+    monkeypatch.setattr(REDDIT_PACER, "wait", wait)
+
+    valid = await PU.PipelineHelper.validate_subreddits(DummyUpdate(), client, ["a", "bad", "random", "b"])
+    assert valid == ["a", "random", "b"]
+    assert state["peak"] == 3
+    # One pacer slot per load; "random" is not loaded here
+    assert len(paced) == 3
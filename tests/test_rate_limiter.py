@@ -0,0 +1,59 @@
+# tests/test_rate_limiter.py
+import asyncio
+import types
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def _reddit(remaining):
+    return types.SimpleNamespace(auth=types.SimpleNamespace(limits={"remaining": remaining, "used": 0}))
+
+
+async def _peak_concurrency(limiter, n=5):
+    state = {"active": 0, "peak": 0}
+
+    async def call():
+        async with limiter:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+
+    await asyncio.gather(*(call() for _ in range(n)))
+    return state["peak"]
+
+
+async def test_limiter_runs_concurrently_with_plenty_of_quota():
+    from redditcommand.utils.rate_limiter import RedditRateLimiter
+    limiter = RedditRateLimiter(_reddit(500), max_concurrency=3)
+    assert await _peak_concurrency(limiter) == 3
+
+
+async def test_limiter_serializes_when_quota_is_low():
+    from redditcommand.utils.rate_limiter import RedditRateLimiter
+    limiter = RedditRateLimiter(_reddit(2), max_concurrency=3, low_watermark=10)
+    assert await _peak_concurrency(limiter) == 1
+
+
+async def test_limiter_raises_when_exhausted_and_not_waiting():
+    from redditcommand.utils.rate_limiter import RedditRateLimiter, RateLimitExhausted
+    limiter = RedditRateLimiter(_reddit(0), wait=False)
+    with pytest.raises(RateLimitExhausted):
+        async with limiter:
+            pass
+
+
+async def test_pacer_allows_burst_then_spaces_requests(monkeypatch):
+    from redditcommand.utils import rate_limiter as RL
+
+    now = {"t": 1000.0}
+    monkeypatch.setattr(RL.time, "monotonic", lambda: now["t"])
+    pacer = RL.RequestPacer(per_minute=60, burst=3)
+
+    assert [pacer.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert pacer.reserve() == pytest.approx(1.0)
+    assert pacer.reserve() == pytest.approx(2.0)
+
+    now["t"] += 10  # idle time refills the burst
+    assert pacer.reserve() == 0.0